@@ -1,551 +1,789 @@
-from slack_bolt import App
+import os
+import re
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from slack_bolt import App, BoltResponse
 from slack_bolt.adapter.socket_mode import SocketModeHandler
-from report_handler import format_bug_report
+from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry.builtin_handlers import RateLimitErrorRetryHandler
+
+from report_handler import format_bug_report, parse_bug_report
 from storage import storage
 from repo_config import repo_manager, code_analyzer, RepositoryConfig, RepoType
-from storage import storage
 from llm_analyzer import llm_analyzer
 from code_file_analyzer import code_analyzer as file_analyzer
 from issue_focused_analyzer import issue_analyzer
-import requests
-from typing import Dict, List
-
-import os
-from dotenv import load_dotenv
+from conversation_store import conversation_store, Conversation
+from reply_sender import ReplySender
+from ttl_cache import TTLCache
 
 load_dotenv()
 
-app = App(token=os.environ["SLACK_BOT_TOKEN"])
+logger = logging.getLogger(__name__)
+
+# Number of worker threads used to process Socket Mode events concurrently
+SOCKET_MODE_CONCURRENCY = int(os.getenv("SLACK_SOCKET_CONCURRENCY", "10"))
+
+# Bolt runs listeners on its own executor (5 threads by default), so it is
+# sized the same as the Socket Mode pool that hands it events
+app = App(
+    token=os.environ["SLACK_BOT_TOKEN"],
+    listener_executor=ThreadPoolExecutor(max_workers=SOCKET_MODE_CONCURRENCY, thread_name_prefix="listener")
+)
+
+# Longest Retry-After, in seconds, worth waiting out on a listener thread
+SLACK_MAX_RETRY_AFTER_SECONDS = 1
+
+class ShortRateLimitRetryHandler(RateLimitErrorRetryHandler):
+    """Retry a rate limited Slack call only when Slack asks for a short wait"""
+    
+    def _can_retry(self, *, state, request, response=None, error=None) -> bool:
+        if not super()._can_retry(state=state, request=request, response=response, error=error):
+            return False
+        retry_after = next((values[0] for name, values in response.headers.items() if name.lower() == "retry-after"), "0")
+        return retry_after.isdigit() and int(retry_after) <= SLACK_MAX_RETRY_AFTER_SECONDS
+
+# app.client is the one Web API client shared by every listener and the reply
+# sender; a short rate limit is retried once, a longer one fails straight away
+# rather than parking a listener thread
+slack_client = app.client
+slack_client.retry_handlers.append(ShortRateLimitRetryHandler(max_retry_count=1))
+
+# Conversation replies, skipped while a channel keeps rejecting posts
+reply_sender = ReplySender(slack_client)
+
+# Repositories of one channel analyzed at the same time by `investigate`
+MAX_REPO_ANALYSIS_WORKERS = 8
+
+# `investigate` commands running at the same time; later ones wait in the queue
+MAX_CONCURRENT_INVESTIGATIONS = 4
+_investigation_executor = ThreadPoolExecutor(
+    max_workers=MAX_CONCURRENT_INVESTIGATIONS, thread_name_prefix="investigate"
+)
+
+# Investigations running or queued at once; past this new ones are turned away
+MAX_PENDING_INVESTIGATIONS = 20
+_investigation_slots = threading.BoundedSemaphore(MAX_PENDING_INVESTIGATIONS)
+
+# LLM and code file analyses of the same commits are reused for an hour
+ANALYSIS_CACHE_TTL_SECONDS = 60 * 60
+_llm_analysis_cache = TTLCache(ANALYSIS_CACHE_TTL_SECONDS, maxsize=256)
+_code_analysis_cache = TTLCache(ANALYSIS_CACHE_TTL_SECONDS, maxsize=256)
+
+# auth.test result (bot user id, team) reused for 10 minutes
+_auth_cache = TTLCache(10 * 60)
+
+def _auth_info() -> Dict:
+    """Get the bot's identity from auth.test, calling Slack at most once per 10 minutes"""
+    auth_data = _auth_cache.get('auth')
+    if auth_data is None:
+        auth_data = slack_client.auth_test().data
+        _auth_cache['auth'] = auth_data
+    return auth_data
+
+def _bot_mention() -> Optional[str]:
+    """Get the bot's own mention markup, or None when auth.test fails"""
+    try:
+        return f"<@{_auth_info()['user_id']}>"
+    except Exception as e:
+        logger.warning("Could not look up the bot user id: %s", e)
+        return None
+
+# Scopes and events the bot needs, printed by check_app_config
+EXPECTED_CONFIG_TEXT = """📋 Expected Configuration:
+   Bot Token Scopes:
+   - app_mentions:read
+   - chat:write
+   - im:history
+   - im:read
+   - im:write
+   - channels:history (for channel messages)
+   - groups:history (for private channel messages)
+   - mpim:history (for group DMs)
+
+   Event Subscriptions:
+   - app_mention
+   - message.channels
+   - message.groups
+   - message.im
+   - message.mpim
+
+🔧 To check your actual configuration:
+   1. Go to https://api.slack.com/apps
+   2. Select your 'Bug Triage Agent' app
+   3. Check 'OAuth & Permissions' for scopes
+   4. Check 'Event Subscriptions' for events"""
 
 def check_app_config():
     """Check and display the current app configuration"""
     try:
-        # Get app info using the bot token
-        headers = {
-            "Authorization": f"Bearer {os.environ['SLACK_BOT_TOKEN']}",
-            "Content-Type": "application/json"
-        }
-        
-        # Get auth info to see scopes
-        auth_response = requests.get("https://slack.com/api/auth.test", headers=headers)
-        if auth_response.status_code == 200:
-            auth_data = auth_response.json()
-            if auth_data.get("ok"):
-                print("✅ Bot authentication successful")
-                print(f"   Bot User ID: {auth_data.get('user_id')}")
-                print(f"   Team: {auth_data.get('team')}")
-                print(f"   User: {auth_data.get('user')}")
-            else:
-                print(f"❌ Auth test failed: {auth_data.get('error')}")
-        
-        # Get app info using the app token (for scopes)
-        app_headers = {
-            "Authorization": f"Bearer {os.environ['SLACK_APP_TOKEN']}",
-            "Content-Type": "application/json"
-        }
-        
+        # Get auth info through the bot's own Web API client
+        try:
+            auth_data = _auth_info()
+            print("✅ Bot authentication successful")
+            print(f"   Bot User ID: {auth_data.get('user_id')}")
+            print(f"   Team: {auth_data.get('team')}")
+            print(f"   User: {auth_data.get('user')}")
+        except SlackApiError as e:
+            print(f"❌ Auth test failed: {e.response.get('error')}")
+
         # Note: We can't get event subscriptions via API without admin permissions
         # But we can show what we expect vs what we have
         
-        print("\n📋 Expected Configuration:")
-        print("   Bot Token Scopes:")
-        print("   - app_mentions:read")
-        print("   - chat:write")
-        print("   - im:history")
-        print("   - im:read")
-        print("   - im:write")
-        print("   - channels:history (for channel messages)")
-        print("   - groups:history (for private channel messages)")
-        print("   - mpim:history (for group DMs)")
-        print("\n   Event Subscriptions:")
-        print("   - app_mention")
-        print("   - message.channels")
-        print("   - message.groups")
-        print("   - message.im")
-        print("   - message.mpim")
-        
-        print("\n🔧 To check your actual configuration:")
-        print("   1. Go to https://api.slack.com/apps")
-        print("   2. Select your 'Bug Triage Agent' app")
-        print("   3. Check 'OAuth & Permissions' for scopes")
-        print("   4. Check 'Event Subscriptions' for events")
+        print("\n" + EXPECTED_CONFIG_TEXT)
         
     except Exception as e:
         print(f"❌ Error checking app config: {e}")
 
-# Store conversation state per user
-user_conversations = {}
+# Conversation state per user (in memory, or Redis when REDIS_URL is set)
+user_conversations = conversation_store
+
+# Events are handled on several worker threads; striped locks serialize events
+# from the same user so two replies can't both read and advance one conversation.
+# The locks only cover this process: with REDIS_URL shared by several replicas,
+# only the atomic pop in _finish_report keeps a report from finishing twice
+_USER_LOCKS = [threading.Lock() for _ in range(64)]
+
+def _user_lock(user_id: str) -> threading.Lock:
+    """Get the lock guarding a user's conversation"""
+    return _USER_LOCKS[hash(user_id) % len(_USER_LOCKS)]
+
+# Matches a Slack user mention such as <@U012ABCDEF>
+_BOT_MENTION_RE = re.compile(r'<@([A-Z0-9]+)>')
+
+# Management command arguments
+_ADD_TAGS_RE = re.compile(r'add tags\s+(\S+)\s+(.+)', re.IGNORECASE)
+_UPDATE_RE = re.compile(r'update\s+(\S+)\s+(summary|steps|pages|components|priority|status)\s+(.+)', re.IGNORECASE)
+_INVESTIGATE_RE = re.compile(r'investigate\s+(\S+)', re.IGNORECASE)
 
 REQUIRED_FIELDS = ["summary", "pages", "steps"]
 OPTIONAL_FIELDS = ["components"]
 
-def parse_bug_report(text):
-    """Parse a bug report text to extract structured information"""
-    import re
+# Guided conversation: the field each answer fills and the prompt for the next step
+STEPS = (
+    ("summary", "Which *page(s)* are affected? (Please paste full URLs)"),
+    ("pages", "How can we *reproduce* the issue?"),
+    ("steps", "Are there any *templates or components* involved? _(Optional)_"),
+    ("components", None)
+)
+
+# Message subtypes that carry a user's reply (None is a plain message)
+USER_MESSAGE_SUBTYPES = {None, "file_share", "thread_broadcast"}
+
+# Shown next to each report in `list reports`
+_STATUS_EMOJI = {
+    'new': '🆕',
+    'in_progress': '🔄',
+    'resolved': '✅',
+    'closed': '🔒'
+}
+_PRIORITY_EMOJI = {
+    'low': '🟢',
+    'medium': '🟡',
+    'high': '🔴',
+    'critical': '🚨'
+}
+
+# Summaries longer than this are cut short in `list reports` and `search`
+LIST_SUMMARY_LIMIT = 50
+
+def _short_summary(summary: Optional[str]) -> Optional[str]:
+    """Cut a report summary down to one listing line"""
+    if summary and len(summary) > LIST_SUMMARY_LIMIT:
+        return f"{summary[:LIST_SUMMARY_LIMIT]}..."
+    return summary
+
+# Closing recommendations of every generated list, after the bug-specific ones
+GENERAL_RECOMMENDATIONS = (
+    "Review recent commits for potential root causes",
+    "Check affected files for syntax errors or logic issues",
+    "Test the reported steps to reproduce the issue"
+)
+
+# LLM analysis sections shown in an investigation report, with their labels
+LLM_ANALYSIS_SECTIONS = (
+    ('wordpress_analysis', 'WordPress Core'),
+    ('theme_analysis', 'Theme Issues'),
+    ('plugin_analysis', 'Plugin Issues'),
+    ('performance_analysis', 'Performance')
+)
+
+# Slack rejects section blocks over 3000 characters and messages over 50 blocks
+SECTION_TEXT_LIMIT = 3000
+MAX_MESSAGE_BLOCKS = 50
+
+# Reply to `help`
+HELP_TEXT = """**Bug Triage Agent Commands:**
+
+📝 **Report a Bug:**
+Just mention me and describe the issue!
+• `cancel` - Exit bug entry session
+
+📋 **Management Commands:**
+• `list reports` - Show recent bug reports
+• `stats` - Show bug report statistics  
+• `search [term]` - Search for reports
+• `update BUG-2025-001 field value` - Update bug report fields
+• `help` - Show this help message
+
+🔧 **Repository Integration:**
+• `config repo project_name type url [branch] [site_type] [hosting_platform]` - Configure repository
+• `add tags project_name tag1 tag2` - Add tags to repository
+• `list repos` - Show repository configurations
+• `analyze changes` - Analyze recent code changes
+• `recent changes` - Same as analyze changes
+
+🔍 **Bug Investigation:**
+• `investigate BUG-2025-001` - Deep dive investigation of a specific bug
+
+**Repository Types:** github, azure, bitbucket, adobe
+**Site Types:** wordpress, react, laravel, vue, etc.
+**Hosting Platforms:** wordpress-vip, netlify, vercel, aws, etc.
+
+**Examples:**
+@Bug Triage Agent config repo client-website github https://github.com/client/website main wordpress wordpress-vip
+@Bug Triage Agent add tags client-website high-traffic seo-critical
+@Bug Triage Agent analyze changes
+@Bug Triage Agent investigate BUG-2025-001
+@Bug Triage Agent update BUG-2025-001 priority high
+@Bug Triage Agent search mobile performance
+@Bug Triage Agent cancel"""
+
+# Sent when a mention starts a new bug report conversation
+NEW_REPORT_PROMPT = """<@%s> Thanks for reporting a bug! 
+
+Please provide the following information in your response:
+
+*Summary:* Brief description of the issue
+*Pages:* Full URLs of affected pages (e.g., https://example.com/page)
+*Steps:* How to reproduce the issue
+*Components:* Any templates/components involved (optional)
+
+You can format it like this:
+```
+Summary: Mobile load issue affecting Core Web Vitals
+Pages: https://wnpf.org/, https://wnpf.org/about
+Steps: Open mobile browser, navigate to homepage, check PageSpeed Insights
+Components: Header template, mobile navigation
+```
+
+Or just describe the issue naturally and I'll try to extract the information."""
+
+# Sent while a mentioned report is still missing required fields
+MISSING_FIELDS_PROMPT = "<@%s> I still need the *%s*. Please provide this information."
+
+# Missing required fields as a bitmask (1 summary, 2 pages, 4 steps) -> phrase
+MISSING_FIELDS_PHRASES = {
+    0b001: "brief summary",
+    0b010: "affected pages/URLs",
+    0b100: "steps to reproduce",
+    0b011: "brief summary and affected pages/URLs",
+    0b101: "brief summary and steps to reproduce",
+    0b110: "affected pages/URLs and steps to reproduce",
+    0b111: "brief summary, affected pages/URLs and steps to reproduce"
+}
+
+def _strip_bot_mention(text: str) -> str:
+    """Remove the bot mention from a stripped message, keeping it stripped"""
+    # Slack puts the mention first in app_mention text, so slicing past the
+    # closing bracket avoids running the regex for the common case
+    if text.startswith('<@'):
+        return text.partition('>')[2].strip()
+    if '<@' not in text:
+        return text
     
-    # Initialize data structure
-    data = {
-        "summary": "",
-        "pages": "",
-        "steps": "",
-        "components": ""
-    }
+    # Elsewhere in the text, remove the bot's own mention when its user id is known
+    bot_mention = _bot_mention()
+    if bot_mention is not None:
+        return text.replace(bot_mention, "", 1).strip() if bot_mention in text else text
     
-    # Extract bot mention if present
-    bot_mention_match = re.search(r'<@([A-Z0-9]+)>', text)
+    bot_mention_match = _BOT_MENTION_RE.search(text)
     if bot_mention_match:
-        bot_id = bot_mention_match.group(1)
-        text = text.replace(f"<@{bot_id}>", "").strip()
+        text = text.replace(bot_mention_match.group(0), "").strip()
+    return text
+
+def _bug_report_message(report: str) -> Dict:
+    """Build the Block Kit message for a finished bug report"""
+    # The report gets a section of its own, cut short so it and its code fence fit the section limit
+    if len(report) > SECTION_TEXT_LIMIT - 6:
+        report = report[:SECTION_TEXT_LIMIT - 7] + "…"
     
-    # Try to extract information using common patterns
-    lines = text.split('\n')
+    return {
+        "text": "✅ Here's your bug report",
+        "blocks": [
+            {"type": "section", "text": {"type": "mrkdwn", "text": "✅ Here's your bug report:"}},
+            {"type": "section", "text": {"type": "mrkdwn", "text": f"```{report}```"}},
+            {"type": "context", "elements": [{"type": "mrkdwn", "text": "I'll notify the dev team!"}]}
+        ]
+    }
+
+def _finish_report(user_id: str, channel: str, user_state: Conversation, say, save: bool = True):
+    """Send a completed bug report to the user and end the conversation, saving the report first if asked"""
+    # End the conversation before anything else; when another bot replica
+    # sharing the store already ended it, that replica sends the report
+    if user_conversations.pop(user_id, None) is None:
+        return
+    data = user_state.data()
     
-    # Look for common patterns and keywords
-    for i, line in enumerate(lines):
-        line_lower = line.lower().strip()
-        
-        # Summary patterns
-        if any(keyword in line_lower for keyword in ['summary:', 'issue:', 'problem:', 'bug:', 'error:']):
-            data["summary"] = line.split(':', 1)[1].strip() if ':' in line else line.strip()
-        elif not data["summary"] and i == 0 and len(line.strip()) > 10:
-            # First substantial line is likely the summary
-            data["summary"] = line.strip()
-        
-        # Pages/URLs patterns
-        if any(keyword in line_lower for keyword in ['page:', 'url:', 'site:', 'website:', 'link:']):
-            data["pages"] = line.split(':', 1)[1].strip() if ':' in line else line.strip()
-        elif 'http' in line and not data["pages"]:
-            # Extract URLs
-            urls = re.findall(r'https?://[^\s]+', line)
-            if urls:
-                data["pages"] = ', '.join(urls)
-        
-        # Steps patterns
-        if any(keyword in line_lower for keyword in ['step:', 'reproduce:', 'how to:', 'steps:']):
-            data["steps"] = line.split(':', 1)[1].strip() if ':' in line else line.strip()
-        
-        # Components patterns
-        if any(keyword in line_lower for keyword in ['component:', 'template:', 'module:', 'feature:']):
-            data["components"] = line.split(':', 1)[1].strip() if ':' in line else line.strip()
-    
-    # If we have a multi-line response, try to intelligently parse
-    if len(lines) > 2 and not any(data.values()):
-        # Try to parse based on line position
-        if len(lines) >= 1:
-            data["summary"] = lines[0].strip()
-        if len(lines) >= 2 and 'http' in lines[1]:
-            data["pages"] = lines[1].strip()
-        if len(lines) >= 3:
-            data["steps"] = lines[2].strip()
-        if len(lines) >= 4:
-            data["components"] = lines[3].strip()
-    
-    return data
+    # Slack is rejecting posts to this channel, so finish the report without rendering a reply
+    if not reply_sender.can_reach(channel):
+        logger.warning("Channel %s is unreachable, finishing bug report from %s without replying", channel, user_id)
+        if save:
+            try:
+                storage.save_bug_report(user_id, channel, data)
+            except Exception:
+                logger.exception("Failed to save bug report from %s", user_id)
+        return
+    
+    # Formatted once; a failed save still shows the report, just without an ID
+    report = format_bug_report(data)
+    if save:
+        try:
+            report_id = storage.save_bug_report(user_id, channel, data)
+            
+            # Add report ID to the formatted report
+            report = f"**Bug Report - {report_id}**\n\n{report}"
+        except Exception:
+            logger.exception("Failed to save bug report from %s", user_id)
+    
+    say(**_bug_report_message(report))
+
+# Event IDs handled in the last 10 minutes; Slack redelivers an event when
+# it misses our ack, and a redelivery must not run a second investigation
+_seen_event_ids = TTLCache(ttl=10 * 60, maxsize=10_000)
+
+@app.middleware
+def skip_redelivered_events(body, request, next):
+    """Acknowledge retried events that were already handled without running them again"""
+    event_id = body.get("event_id")
+    if event_id:
+        if event_id in _seen_event_ids:
+            logger.info("Skipping redelivered event %s (retry %s)", event_id,
+                        request.headers.get("x-slack-retry-num", ["?"])[0])
+            return BoltResponse(status=200, body="")
+        _seen_event_ids[event_id] = True
+    return next()
 
 @app.event("app_mention")
-def handle_mention(event, say):
+def handle_mention(event: Dict, say):
     user_id = event["user"]
     channel = event.get("channel")
-    text = event.get("text", "").strip()
+    text = event.get("text") or ""
+    if text and (text[0].isspace() or text[-1].isspace()):
+        text = text.strip()
+    
+    # Remove the bot mention once; commands and report parsing both get the clean text
+    text = _strip_bot_mention(text)
     
     # Check if this is a management command first
     if handle_management_commands(text, user_id, say, channel_id=channel):
         return
     
+    with _user_lock(user_id):
+        _handle_bug_report_reply(user_id, channel, text, say)
+
+def _handle_bug_report_reply(user_id: str, channel: str, text: str, say):
+    """Continue the user's bug report conversation, or start a new one"""
     # If user is already in a conversation, try to parse their response
-    if user_id in user_conversations:
-        user_state = user_conversations[user_id]
+    user_state = user_conversations.get(user_id)
+    if user_state is not None:
         
         # Parse the response
         parsed_data = parse_bug_report(text)
         
         # Update existing data with new parsed data
         for key, value in parsed_data.items():
-            if value and not user_state["data"].get(key):
-                user_state["data"][key] = value
+            if value and not getattr(user_state, key):
+                setattr(user_state, key, value)
         
         # Check what's missing
-        missing_fields = []
-        if not user_state["data"].get("summary"):
-            missing_fields.append("brief summary")
-        if not user_state["data"].get("pages"):
-            missing_fields.append("affected pages/URLs")
-        if not user_state["data"].get("steps"):
-            missing_fields.append("steps to reproduce")
+        missing = (not user_state.summary) | (not user_state.pages) << 1 | (not user_state.steps) << 2
         
-        if missing_fields:
-            missing_text = ", ".join(missing_fields[:-1])
-            if len(missing_fields) > 1:
-                missing_text += f" and {missing_fields[-1]}"
-            else:
-                missing_text = missing_fields[0]
-            
-            say(f"<@{user_id}> I still need the *{missing_text}*. Please provide this information.")
+        if missing:
+            user_conversations[user_id] = user_state
+            say(MISSING_FIELDS_PROMPT % (user_id, MISSING_FIELDS_PHRASES[missing]))
         else:
             # We have all required fields, save to database and generate the report
-            try:
-                report_id = storage.save_bug_report(user_id, channel, user_state["data"])
-                report = format_bug_report(user_state["data"])
-                
-                # Add report ID to the formatted report
-                report_with_id = f"**Bug Report - {report_id}**\n\n{report}"
-                
-                say(f"✅ Here's your bug report:\n```{report_with_id}```\nI'll notify the dev team!")
-                
-            except Exception as e:
-                report = format_bug_report(user_state["data"])
-                say(f"✅ Here's your bug report:\n```{report}```\nI'll notify the dev team!")
-            
-            del user_conversations[user_id]
+            _finish_report(user_id, channel, user_state, say)
         return
     
     # Start new conversation with template
-    user_conversations[user_id] = {"step": 0, "data": {}}
+    user_conversations[user_id] = Conversation()
     
-    template_message = f"""<@{user_id}> Thanks for reporting a bug! 
+    say(NEW_REPORT_PROMPT % user_id)
 
-Please provide the following information in your response:
+def _cmd_cancel(text: str, user_id: str, say, channel_id: str) -> bool:
+    """Cancel/exit bug entry session"""
+    if user_conversations.pop(user_id, None) is not None:
+        say("❌ Bug report cancelled. You can start a new one anytime!")
+    else:
+        say("No active bug report session to cancel.")
+    return True
 
-*Summary:* Brief description of the issue
-*Pages:* Full URLs of affected pages (e.g., https://example.com/page)
-*Steps:* How to reproduce the issue
-*Components:* Any templates/components involved (optional)
+def _cmd_list_reports(text: str, user_id: str, say, channel_id: str) -> bool:
+    """List recent reports"""
+    reports = storage.get_bug_reports(limit=5)
+    if reports:
+        parts = ["**Recent Bug Reports:**\n"]
+        for report in reports:
+            status_emoji = _STATUS_EMOJI.get(report['status'], '❓')
+            priority_emoji = _PRIORITY_EMOJI.get(report['priority'], '⚪')
 
-You can format it like this:
-```
-Summary: Mobile load issue affecting Core Web Vitals
-Pages: https://wnpf.org/, https://wnpf.org/about
-Steps: Open mobile browser, navigate to homepage, check PageSpeed Insights
-Components: Header template, mobile navigation
-```
+            parts.append(f"{status_emoji} {priority_emoji} *{report['report_id']}* - {_short_summary(report['summary'])}\n")
+            parts.append(f"   Status: {report['status']}, Priority: {report['priority']}, Created: {report['created_at'][:10]}\n\n")
+    else:
+        parts = ["No bug reports found."]
 
-Or just describe the issue naturally and I'll try to extract the information."""
-    
-    say(template_message)
+    say("".join(parts))
+    return True
 
-def handle_management_commands(text: str, user_id: str, say, channel_id: str = None) -> bool:
-    """Handle management commands for bug reports"""
+def _cmd_stats(text: str, user_id: str, say, channel_id: str) -> bool:
+    """Show stats"""
+    stats = storage.get_stats()
+    parts = ["**Bug Report Statistics:**\n"]
+    parts.append(f"📊 Total Reports: {stats['total']}\n")
+    parts.append(f"📈 Recent (7 days): {stats['recent_7_days']}\n\n")
 
-    # Extract bot mention if present
-    import re
-    bot_mention_match = re.search(r'<@([A-Z0-9]+)>', text)
-    if bot_mention_match:
-        bot_id = bot_mention_match.group(1)
-        text = text.replace(f"<@{bot_id}>", "").strip()
-    
-    text_lower = text.lower().strip()
+    if stats['by_status']:
+        parts.append("**By Status:**\n")
+        for status, count in stats['by_status'].items():
+            parts.append(f"  {status}: {count}\n")
 
-    
-    # Check for management commands
-    if text_lower in ['cancel', 'exit', 'quit', 'stop', 'nevermind']:
-        # Cancel/exit bug entry session
-        if user_id in user_conversations:
-            del user_conversations[user_id]
-            say("❌ Bug report cancelled. You can start a new one anytime!")
-        else:
-            say("No active bug report session to cancel.")
-        return True
-    
-    elif text_lower.startswith('list reports') or text_lower.startswith('show reports') or text_lower.startswith('reports'):
-        # List recent reports
-        reports = storage.get_bug_reports(limit=5)
-        if reports:
-            response = "**Recent Bug Reports:**\n"
-            for report in reports:
-                status_emoji = {
-                    'new': '🆕',
-                    'in_progress': '🔄',
-                    'resolved': '✅',
-                    'closed': '🔒'
-                }.get(report['status'], '❓')
-                
-                priority_emoji = {
-                    'low': '🟢',
-                    'medium': '🟡',
-                    'high': '🔴',
-                    'critical': '🚨'
-                }.get(report['priority'], '⚪')
-                
-                response += f"{status_emoji} {priority_emoji} *{report['report_id']}* - {report['summary']}\n"
-                response += f"   Status: {report['status']}, Priority: {report['priority']}, Created: {report['created_at'][:10]}\n\n"
-        else:
-            response = "No bug reports found."
-        
-        say(response)
-        return True
-    
-    # Show stats
-    elif any(cmd in text_lower for cmd in ['stats', 'statistics', 'show stats']):
-        stats = storage.get_stats()
-        response = "**Bug Report Statistics:**\n"
-        response += f"📊 Total Reports: {stats['total']}\n"
-        response += f"📈 Recent (7 days): {stats['recent_7_days']}\n\n"
-        
-        if stats['by_status']:
-            response += "**By Status:**\n"
-            for status, count in stats['by_status'].items():
-                response += f"  {status}: {count}\n"
-        
-        if stats['by_priority']:
-            response += "\n**By Priority:**\n"
-            for priority, count in stats['by_priority'].items():
-                response += f"  {priority}: {count}\n"
-        
-        say(response)
-        return True
-    
-    # Search reports
-    elif text_lower.startswith('search '):
-        # Extract search query - look for 'search' keyword and get everything after it
-        if text_lower.startswith('search '):
-            query = text[7:].strip()  # Remove 'search ' prefix
-        else:
-            # Find 'search' in the text and get everything after it
-            search_index = text_lower.find('search')
-            query = text[search_index + 6:].strip()  # Remove 'search' keyword
-        if query:
-            reports = storage.search_bug_reports(query, limit=3)
-            if reports:
-                response = f"**Search Results for '{query}':**\n"
-                for report in reports:
-                    response += f"🔍 *{report['report_id']}* - {report['summary']}\n"
-                    response += f"   Status: {report['status']}, Created: {report['created_at'][:10]}\n\n"
+    if stats['by_priority']:
+        parts.append("\n**By Priority:**\n")
+        for priority, count in stats['by_priority'].items():
+            parts.append(f"  {priority}: {count}\n")
+
+    say("".join(parts))
+    return True
+
+def _cmd_search(text: str, user_id: str, say, channel_id: str) -> bool:
+    """Search reports"""
+    # Everything after the 'search' keyword is the query
+    parts = text.split(None, 1)
+    query = parts[1].strip() if len(parts) > 1 else ""
+    if not query:
+        return False
+
+    reports = storage.search_bug_reports(query, limit=3)
+    if reports:
+        parts = [f"**Search Results for '{query}':**\n"]
+        for report in reports:
+            parts.append(f"🔍 *{report['report_id']}* - {_short_summary(report['summary'])}\n")
+            parts.append(f"   Status: {report['status']}, Created: {report['created_at'][:10]}\n\n")
+    else:
+        parts = [f"No reports found matching '{query}'."]
+
+    say("".join(parts))
+    return True
+
+def _cmd_config_repo(text: str, user_id: str, say, channel_id: str) -> bool:
+    """Repository configuration commands"""
+    # Format: config repo project_name repo_type repo_url [branch] [site_type] [hosting_platform]
+    parts = text.split()
+    if len(parts) >= 4:
+        project_name = parts[2]
+        repo_type_str = parts[3].lower()
+        repo_url = parts[4] if len(parts) > 4 else ""
+        branch = parts[5] if len(parts) > 5 else "main"
+        site_type = parts[6] if len(parts) > 6 else ""
+        hosting_platform = parts[7] if len(parts) > 7 else ""
+
+        try:
+            repo_type = RepoType(repo_type_str)
+            repo_config = RepositoryConfig(
+                name=project_name,
+                type=repo_type,
+                url=repo_url,
+                token="",  # Would need to be provided securely
+                branch=branch,
+                site_type=site_type,
+                hosting_platform=hosting_platform
+            )
+
+            success = repo_manager.add_channel_config(
+                channel_id, f"channel-{channel_id}", project_name, [repo_config]
+            )
+
+            if success:
+                response = f"✅ Repository configured for project: *{project_name}*\nType: {repo_type.value}\nURL: {repo_url}\nBranch: {branch}"
+                if site_type:
+                    response += f"\nSite Type: {site_type}"
+                if hosting_platform:
+                    response += f"\nHosting Platform: {hosting_platform}"
+                say(response)
             else:
-                response = f"No reports found matching '{query}'."
-            
-            say(response)
-            return True
-    
-    # Repository configuration commands
-    elif 'config repo' in text_lower:
-        # Format: config repo project_name repo_type repo_url [branch] [site_type] [hosting_platform]
-        # Find the actual command part after bot mention
-        # Parse the config repo command manually
-        parts = text.split()
-        if len(parts) >= 4 and parts[0].lower() == 'config' and parts[1].lower() == 'repo':
-            project_name = parts[2]
-            repo_type_str = parts[3].lower()
-            repo_url = parts[4] if len(parts) > 4 else ""
-            branch = parts[5] if len(parts) > 5 else "main"
-            site_type = parts[6] if len(parts) > 6 else ""
-            hosting_platform = parts[7] if len(parts) > 7 else ""
-            
-            try:
-                repo_type = RepoType(repo_type_str)
-                repo_config = RepositoryConfig(
-                    name=project_name,
-                    type=repo_type,
-                    url=repo_url,
-                    token="",  # Would need to be provided securely
-                    branch=branch,
-                    site_type=site_type,
-                    hosting_platform=hosting_platform
-                )
-                
-                success = repo_manager.add_channel_config(
-                    channel_id, f"channel-{channel_id}", project_name, [repo_config]
-                )
-                
-                if success:
-                    response = f"✅ Repository configured for project: *{project_name}*\nType: {repo_type.value}\nURL: {repo_url}\nBranch: {branch}"
-                    if site_type:
-                        response += f"\nSite Type: {site_type}"
-                    if hosting_platform:
-                        response += f"\nHosting Platform: {hosting_platform}"
-                    say(response)
-                else:
-                    say("❌ Failed to configure repository")
-                    
-            except ValueError:
-                say(f"❌ Invalid repository type: {repo_type_str}\nSupported types: github, azure, bitbucket, adobe")
-        else:
-            say("❌ Usage: `config repo project_name repo_type repo_url [branch] [site_type] [hosting_platform]`\nExample: `config repo client-website github https://github.com/client/website main wordpress wordpress-vip`")
-        return True
-    
-    # Add tags to repository
-    elif text_lower.startswith('add tags'):
-        # Format: add tags project_name tag1 tag2 tag3
-        tag_match = re.search(r'add tags\s+(\S+)\s+(.+)', text, re.IGNORECASE)
-        if tag_match:
-            project_name = tag_match.group(1)
-            tags_text = tag_match.group(2)
-            tags = [tag.strip() for tag in tags_text.split()]
-            
-            # Get current config and update tags
-            configs = repo_manager.list_channel_configs()
-            for config in configs:
-                for repo in config['repos']:
-                    if repo['name'] == project_name:
-                        # Update tags
-                        current_tags = repo.get('custom_tags', [])
-                        new_tags = list(set(current_tags + tags))  # Remove duplicates
-                        repo['custom_tags'] = new_tags
-                        
-                        # Re-save the configuration
-                        repo_config = RepositoryConfig(
-                            name=repo['name'],
-                            type=RepoType(repo['type']),
-                            url=repo['url'],
-                            token=repo.get('token', ''),
-                            branch=repo.get('branch', 'main'),
-                            site_type=repo.get('site_type', ''),
-                            hosting_platform=repo.get('hosting_platform', ''),
-                            business_domain=repo.get('business_domain', ''),
-                            custom_tags=new_tags
-                        )
-                        
-                        success = repo_manager.add_channel_config(
-                            config['channel_id'], config['channel_name'], config['project_name'], [repo_config]
-                        )
-                        
-                        if success:
-                            say(f"✅ Added tags to *{project_name}*: {', '.join(tags)}\nAll tags: {', '.join(new_tags)}")
-                        else:
-                            say("❌ Failed to update repository tags")
-                        return True
-            
-            say(f"❌ Project *{project_name}* not found")
-        else:
-            say("❌ Usage: `add tags project_name tag1 tag2 tag3`\nExample: `add tags client-website high-traffic seo-critical compliance`")
-        return True
-    
-    # Analyze recent changes
-    elif any(cmd in text_lower for cmd in ['analyze changes', 'recent changes', 'code analysis']):
-        analysis = code_analyzer.analyze_recent_changes(channel_id)
-        
-        if "error" in analysis:
-            say(f"❌ {analysis['error']}\nUse `config repo` to set up repository configuration first.")
-        else:
-            response = f"**Code Analysis for {analysis['project']}:**\n\n"
-            for repo in analysis['repositories']:
-                response += f"📁 *{repo['name']}* ({repo['type']})\n"
-                response += f"   Status: {repo['status']}\n"
-                if repo.get('recent_commits'):
-                    response += f"   Recent commits: {len(repo['recent_commits'])}\n"
-                response += "\n"
-            
-            say(response)
-        return True
-    
-    # List repository configurations
-    elif any(cmd in text_lower for cmd in ['list repos', 'show repos', 'repo configs', 'list repositories']):
-        configs = repo_manager.list_channel_configs()
-        
-        if configs:
-            response = "**Repository Configurations:**\n\n"
-            for config in configs:
-                response += f"📂 *{config['project_name']}* (Channel: {config['channel_name']})\n"
-                for repo in config['repos']:
-                    response += f"   • {repo['name']} ({repo['type']}) - {repo['url']}\n"
-                    if repo.get('site_type'):
-                        response += f"     Site Type: {repo['site_type']}\n"
-                    if repo.get('hosting_platform'):
-                        response += f"     Hosting: {repo['hosting_platform']}\n"
-                    if repo.get('custom_tags'):
-                        response += f"     Tags: {', '.join(repo['custom_tags'])}\n"
-                response += "\n"
-        else:
-            response = "No repository configurations found.\nUse `config repo` to set up repositories."
-        
-        say(response)
-        return True
-    
-    # Update bug report
-    elif text_lower.startswith('update'):
-        update_match = re.search(r'update\s+(\S+)\s+(summary|steps|pages|components|priority|status)\s+(.+)', text, re.IGNORECASE)
-        if update_match:
-            report_id = update_match.group(1)
-            field = update_match.group(2).lower()
-            new_value = update_match.group(3).strip()
-            
-            report = storage.get_bug_report(report_id)
-            if not report:
-                say(f"❌ Bug report *{report_id}* not found")
+                say("❌ Failed to configure repository")
+
+        except ValueError:
+            say(f"❌ Invalid repository type: {repo_type_str}\nSupported types: github, azure, bitbucket, adobe")
+    else:
+        say("❌ Usage: `config repo project_name repo_type repo_url [branch] [site_type] [hosting_platform]`\nExample: `config repo client-website github https://github.com/client/website main wordpress wordpress-vip`")
+    return True
+
+def _cmd_add_tags(text: str, user_id: str, say, channel_id: str) -> bool:
+    """Add tags to repository"""
+    # Format: add tags project_name tag1 tag2 tag3
+    tag_match = _ADD_TAGS_RE.search(text)
+    if tag_match:
+        project_name = tag_match.group(1)
+        tags_text = tag_match.group(2)
+        tags = [tag.strip() for tag in tags_text.split()]
+
+        # Look the project up in the repository name index
+        entry = repo_manager.find_repo(project_name)
+        if entry:
+            config, repo = entry
+
+            # Update tags
+            current_tags = repo.get('custom_tags', [])
+            if set(tags).issubset(current_tags):
+                say(f"ℹ️ *{project_name}* already has these tags\nAll tags: {', '.join(current_tags)}")
                 return True
-            
-            # Update the specified field
-            success = storage.update_bug_report(report_id, {field: new_value})
+            new_tags = list(dict.fromkeys([*current_tags, *tags]))  # Remove duplicates, keep order
+
+            # Re-save the channel's whole repository list in one write; saving only
+            # the tagged repository would drop the channel's other repositories
+            repo_configs = [RepositoryConfig.from_dict(channel_repo) for channel_repo in config['repos']]
+            for repo_config in repo_configs:
+                if repo_config.name == project_name:
+                    repo_config.custom_tags = new_tags
+
+            success = repo_manager.add_channel_config(
+                config['channel_id'], config['channel_name'], config['project_name'], repo_configs
+            )
+
             if success:
-                say(f"✅ Updated *{field}* for bug report *{report_id}*\nNew value: {new_value}")
+                say(f"✅ Added tags to *{project_name}*: {', '.join(tags)}\nAll tags: {', '.join(new_tags)}")
             else:
-                say(f"❌ Failed to update bug report *{report_id}*")
-        else:
-            say("❌ Usage: `update BUG-2025-001 summary New summary text`\nSupported fields: summary, steps, pages, components, priority, status\nExample: `update BUG-2025-001 priority high`")
-        return True
-    
-    # Investigate specific bug report
-    elif text_lower.startswith('investigate'):
-        # Format: investigate BUG-2025-001
-        investigate_match = re.search(r'investigate\s+(\S+)', text, re.IGNORECASE)
-        if investigate_match:
-            report_id = investigate_match.group(1)
-            
-            # Get the bug report
-            report = storage.get_bug_report(report_id)
-            if not report:
-                say(f"❌ Bug report *{report_id}* not found")
-                return True
-            
-            # Get repository configuration for this channel
-            config = repo_manager.get_channel_config(channel_id)
-            if not config:
-                say(f"❌ No repository configuration found for this channel.\nUse `config repo` to set up repositories first.")
-                return True
-            
-            # Analyze the bug with repository context
-            investigation = _investigate_bug(report, config)
-            
-            # Format and send the investigation report
-            response = _format_investigation_report(report, investigation)
-            say(response)
+                say("❌ Failed to update repository tags")
             return True
+
+        say(f"❌ Project *{project_name}* not found")
+    else:
+        say("❌ Usage: `add tags project_name tag1 tag2 tag3`\nExample: `add tags client-website high-traffic seo-critical compliance`")
+    return True
+
+def _cmd_analyze_changes(text: str, user_id: str, say, channel_id: str) -> bool:
+    """Analyze recent changes"""
+    analysis = code_analyzer.analyze_recent_changes(channel_id)
+
+    if "error" in analysis:
+        say(f"❌ {analysis['error']}\nUse `config repo` to set up repository configuration first.")
+    else:
+        parts = [f"**Code Analysis for {analysis['project']}:**\n\n"]
+        for repo in analysis['repositories']:
+            parts.append(f"📁 *{repo['name']}* ({repo['type']})\n")
+            parts.append(f"   Status: {repo['status']}\n")
+            if recent_commits := repo.get('recent_commits'):
+                parts.append(f"   Recent commits: {len(recent_commits)}\n")
+            parts.append("\n")
+
+        say("".join(parts))
+    return True
+
+def _cmd_list_repos(text: str, user_id: str, say, channel_id: str) -> bool:
+    """List repository configurations"""
+    configs = repo_manager.list_channel_configs()
+
+    if configs:
+        parts = ["**Repository Configurations:**\n\n"]
+        for config in configs:
+            parts.append(f"📂 *{config['project_name']}* (Channel: {config['channel_name']})\n")
+            for repo in config['repos']:
+                parts.append(f"   • {repo['name']} ({repo['type']}) - {repo['url']}\n")
+                if repo.get('site_type'):
+                    parts.append(f"     Site Type: {repo['site_type']}\n")
+                if repo.get('hosting_platform'):
+                    parts.append(f"     Hosting: {repo['hosting_platform']}\n")
+                if repo.get('custom_tags'):
+                    parts.append(f"     Tags: {', '.join(repo['custom_tags'])}\n")
+            parts.append("\n")
+    else:
+        parts = ["No repository configurations found.\nUse `config repo` to set up repositories."]
+
+    say("".join(parts))
+    return True
+
+def _cmd_update(text: str, user_id: str, say, channel_id: str) -> bool:
+    """Update bug report"""
+    update_match = _UPDATE_RE.search(text)
+    if update_match:
+        report_id = update_match.group(1)
+        field = update_match.group(2).lower()
+        new_value = update_match.group(3).strip()
+
+        report = storage.get_bug_report(report_id)
+        if not report:
+            say(f"❌ Bug report *{report_id}* not found")
+            return True
+
+        # Update the specified field
+        success = storage.update_bug_report(report_id, {field: new_value})
+        if success:
+            say(f"✅ Updated *{field}* for bug report *{report_id}*\nNew value: {new_value}")
         else:
-            say("❌ Usage: `investigate BUG-2025-001`\nExample: `investigate BUG-2025-001`")
-        return True
-    
-    # Help command
-    elif text_lower in ['help', 'commands', 'what can you do']:
-        help_text = """**Bug Triage Agent Commands:**
+            say(f"❌ Failed to update bug report *{report_id}*")
+    else:
+        say("❌ Usage: `update BUG-2025-001 summary New summary text`\nSupported fields: summary, steps, pages, components, priority, status\nExample: `update BUG-2025-001 priority high`")
+    return True
 
-📝 **Report a Bug:**
-Just mention me and describe the issue!
-• `cancel` - Exit bug entry session
+def _run_investigation(report: Dict, config: Dict, say):
+    """Investigate a bug report and post the result, in the background"""
+    try:
+        # Analyze the bug with repository context
+        investigation = _investigate_bug(report, config)
 
-📋 **Management Commands:**
-• `list reports` - Show recent bug reports
-• `stats` - Show bug report statistics  
-• `search [term]` - Search for reports
-• `update BUG-2025-001 field value` - Update bug report fields
-• `help` - Show this help message
+        # Format and send the investigation report
+        say(**_investigation_report_message(report, investigation))
+    except Exception:
+        logger.exception("Investigation of %s failed", report['report_id'])
+        say(f"❌ Investigation of *{report['report_id']}* failed, please try again later")
+    finally:
+        _investigation_slots.release()
 
-🔧 **Repository Integration:**
-• `config repo project_name type url [branch] [site_type] [hosting_platform]` - Configure repository
-• `add tags project_name tag1 tag2` - Add tags to repository
-• `list repos` - Show repository configurations
-• `analyze changes` - Analyze recent code changes
-• `recent changes` - Same as analyze changes
+def _cmd_investigate(text: str, user_id: str, say, channel_id: str) -> bool:
+    """Investigate specific bug report"""
+    # Format: investigate BUG-2025-001
+    investigate_match = _INVESTIGATE_RE.search(text)
+    if investigate_match:
+        report_id = investigate_match.group(1)
 
-🔍 **Bug Investigation:**
-• `investigate BUG-2025-001` - Deep dive investigation of a specific bug
+        # Get the bug report
+        report = storage.get_bug_report(report_id)
+        if not report:
+            say(f"❌ Bug report *{report_id}* not found")
+            return True
 
-**Repository Types:** github, azure, bitbucket, adobe
-**Site Types:** wordpress, react, laravel, vue, etc.
-**Hosting Platforms:** wordpress-vip, netlify, vercel, aws, etc.
+        # Get repository configuration for this channel
+        config = repo_manager.get_channel_config(channel_id)
+        if not config:
+            say(f"❌ No repository configuration found for this channel.\nUse `config repo` to set up repositories first.")
+            return True
 
-**Examples:**
-@Bug Triage Agent config repo client-website github https://github.com/client/website main wordpress wordpress-vip
-@Bug Triage Agent add tags client-website high-traffic seo-critical
-@Bug Triage Agent analyze changes
-@Bug Triage Agent investigate BUG-2025-001
-@Bug Triage Agent update BUG-2025-001 priority high
-@Bug Triage Agent search mobile performance
-@Bug Triage Agent cancel"""
-        
-        say(help_text)
-        return True
+        # Turn the request away rather than queue work nobody will wait for
+        if not _investigation_slots.acquire(blocking=False):
+            say("⏳ Too many investigations are running right now, please try again in a few minutes")
+            return True
+
+        # Investigations take a while, so run them off the listener threads
+        say(f"🔍 Investigating *{report_id}*, the report will follow shortly...")
+        _investigation_executor.submit(_run_investigation, report, config, say)
+    else:
+        say("❌ Usage: `investigate BUG-2025-001`\nExample: `investigate BUG-2025-001`")
+    return True
+
+def _cmd_help(text: str, user_id: str, say, channel_id: str) -> bool:
+    """Help command"""
+    say(HELP_TEXT)
+    return True
+
+# Characters of a message looked at when matching commands, several times the longest command key
+COMMAND_LOOKUP_CHARS = 64
+
+# Commands that only match when they are the whole message
+_EXACT_COMMANDS = {
+    'cancel': _cmd_cancel,
+    'exit': _cmd_cancel,
+    'quit': _cmd_cancel,
+    'stop': _cmd_cancel,
+    'nevermind': _cmd_cancel,
+    'help': _cmd_help,
+    'commands': _cmd_help,
+    'what can you do': _cmd_help
+}
+
+# Commands keyed by their first two words, or by their first word alone
+_COMMAND_TABLE = {
+    'list reports': _cmd_list_reports,
+    'show reports': _cmd_list_reports,
+    'reports': _cmd_list_reports,
+    'stats': _cmd_stats,
+    'statistics': _cmd_stats,
+    'show stats': _cmd_stats,
+    'search': _cmd_search,
+    'config repo': _cmd_config_repo,
+    'add tags': _cmd_add_tags,
+    'analyze changes': _cmd_analyze_changes,
+    'recent changes': _cmd_analyze_changes,
+    'code analysis': _cmd_analyze_changes,
+    'list repos': _cmd_list_repos,
+    'show repos': _cmd_list_repos,
+    'repo configs': _cmd_list_repos,
+    'list repositories': _cmd_list_repos,
+    'update': _cmd_update,
+    'investigate': _cmd_investigate
+}
+
+def handle_management_commands(text: str, user_id: str, say, channel_id: str = None) -> bool:
+    """Handle management commands for bug reports, given text with the bot mention removed"""
+
+    # Only the start of the text can name a command, so a long bug report is
+    # never lowercased or split whole; handlers match case-insensitively
+    text_lower = text[:COMMAND_LOOKUP_CHARS].lower()
+
+    handler = _EXACT_COMMANDS.get(text_lower) if len(text) <= COMMAND_LOOKUP_CHARS else None
+    if handler is None:
+        words = text_lower.split(None, 2)
+        if not words:
+            return False
+        handler = _COMMAND_TABLE.get(" ".join(words[:2])) or _COMMAND_TABLE.get(words[0])
+        if handler is None:
+            return False
+
+    return handler(text, user_id, say, channel_id)
+
+def _analyze_one_repo(repo_config: Dict, report: Dict) -> Tuple[Dict, Optional[Dict], Optional[Dict]]:
+    """Fetch recent changes for one repository, plus LLM and code analysis for WordPress sites"""
+    repo_type = repo_config.get('type', 'github')
+    site_type = repo_config.get('site_type', '').lower()
+    logger.debug("Analyzing %s repository: %s (Site type: %s)", repo_type, repo_config['name'], site_type)
     
+    if repo_type == 'azure':
+        repo_analysis = code_analyzer._analyze_azure_repo(repo_config, days=7)
+    elif repo_type == 'github':
+        repo_analysis = code_analyzer._analyze_github_repo(repo_config, days=7)
+    else:
+        repo_analysis = code_analyzer._analyze_github_repo(repo_config, days=7)  # fallback
+    
+    # Perform LLM analysis for WordPress sites
+    if site_type != 'wordpress' or not repo_analysis.get('recent_commits'):
+        return repo_analysis, None, None
+    
+    commit_shas = tuple(commit['sha'] for commit in repo_analysis['recent_commits'])
+    
+    # The LLM analysis also depends on the report, so an edited report is analyzed again
+    llm_key = (repo_config['url'], commit_shas, report.get('report_id'), report.get('updated_at'))
+    llm_analysis = _llm_analysis_cache.get(llm_key)
+    if llm_analysis is None:
+        logger.debug("Performing LLM analysis for WordPress site: %s", repo_config['name'])
+        llm_analysis = llm_analyzer.analyze_wordpress_site(
+            repo_config['url'],
+            report,
+            repo_analysis['recent_commits']
+        )
+        # 'error' is also set when any LLM call failed or fell back to canned text
+        if 'error' not in llm_analysis:
+            _llm_analysis_cache[llm_key] = llm_analysis
+    
+    # Perform deep code file analysis
+    code_key = (repo_config['url'], commit_shas)
+    code_analysis = _code_analysis_cache.get(code_key)
+    if code_analysis is None:
+        logger.debug("Performing deep code analysis for WordPress site: %s", repo_config['name'])
+        code_analysis = file_analyzer.analyze_wordpress_site_code(
+            repo_config,
+            repo_analysis['recent_commits']
+        )
+        if 'error' not in code_analysis:
+            _code_analysis_cache[code_key] = code_analysis
 
-    return False
+    return repo_analysis, llm_analysis, code_analysis
 
 def _investigate_bug(report: Dict, config: Dict) -> Dict:
     """Investigate a bug report using repository analysis and LLM code analysis"""
@@ -565,66 +803,49 @@ def _investigate_bug(report: Dict, config: Dict) -> Dict:
         'focused_analysis': {}
     }
     
-    # Analyze each repository in the configuration
-    for repo_config in config['repos']:
-        repo_type = repo_config.get('type', 'github')
-        site_type = repo_config.get('site_type', '').lower()
-        print(f"Analyzing {repo_type} repository: {repo_config['name']} (Site type: {site_type})")
-        
-        if repo_type == 'azure':
-            repo_analysis = code_analyzer._analyze_azure_repo(repo_config, days=7)
-        elif repo_type == 'github':
-            repo_analysis = code_analyzer._analyze_github_repo(repo_config, days=7)
-        else:
-            repo_analysis = code_analyzer._analyze_github_repo(repo_config, days=7)  # fallback
-        investigation['repository_analysis'].append(repo_analysis)
-        
+    # Analyze the repositories concurrently, then merge the results in config order
+    repos = config['repos']
+    with ThreadPoolExecutor(max_workers=min(MAX_REPO_ANALYSIS_WORKERS, len(repos)) or 1) as executor:
+        results = list(executor.map(partial(_analyze_one_repo, report=report), repos))
+    
+    # Merge into local lists and store them on the investigation once at the end
+    potential_causes = []
+    recent_changes = []
+    affected_components = []
+    recommendations = []
+    
+    for repo_analysis, llm_analysis, code_analysis in results:
         # Extract potential causes from high-impact commits
         if repo_analysis.get('impact_analysis'):
-            high_impact = repo_analysis['impact_analysis'].get('high_impact_commits', [])
-            for commit in high_impact:
-                investigation['potential_causes'].append({
-                    'commit': commit['sha'],
-                    'message': commit['message'],
-                    'author': commit['author'],
-                    'date': commit['date'],
-                    'url': commit['url'],
-                    'impact_score': commit['impact_score']
-                })
+            potential_causes.extend({
+                'commit': commit['sha'],
+                'message': commit['message'],
+                'author': commit['author'],
+                'date': commit['date'],
+                'url': commit['url'],
+                'impact_score': commit['impact_score']
+            } for commit in repo_analysis['impact_analysis'].get('high_impact_commits', []))
         
         # Track recent changes
         if repo_analysis.get('recent_commits'):
-            investigation['recent_changes'].extend(repo_analysis['recent_commits'][:3])
+            recent_changes.extend(repo_analysis['recent_commits'][:3])
         
         # Track affected components
         if repo_analysis.get('changed_files'):
-            investigation['affected_components'].extend(repo_analysis['changed_files'])
+            affected_components.extend(repo_analysis['changed_files'])
         
-        # Perform LLM analysis for WordPress sites
-        if site_type == 'wordpress' and repo_analysis.get('recent_commits'):
-            print(f"Performing LLM analysis for WordPress site: {repo_config['name']}")
-            llm_analysis = llm_analyzer.analyze_wordpress_site(
-                repo_config['url'],
-                report,
-                repo_analysis['recent_commits']
-            )
+        # Merge the LLM and code analysis of WordPress sites
+        if llm_analysis is not None:
             investigation['llm_analysis'] = llm_analysis
-            
-            # Perform deep code file analysis
-            print(f"Performing deep code analysis for WordPress site: {repo_config['name']}")
-            code_analysis = file_analyzer.analyze_wordpress_site_code(
-                repo_config,
-                repo_analysis['recent_commits']
-            )
             investigation['code_analysis'] = code_analysis
             
             # Add LLM recommendations to overall recommendations
             if llm_analysis.get('recommendations'):
-                investigation['recommendations'].extend(llm_analysis['recommendations'])
+                recommendations.extend(llm_analysis['recommendations'])
             
             # Add code analysis recommendations
             if code_analysis.get('specific_recommendations'):
-                investigation['recommendations'].extend(code_analysis['specific_recommendations'])
+                recommendations.extend(code_analysis['specific_recommendations'])
             
             # Add risk assessment
             if llm_analysis.get('risk_assessment'):
@@ -633,9 +854,15 @@ def _investigate_bug(report: Dict, config: Dict) -> Dict:
             # Apply issue-focused filtering to the analysis results
             investigation['focused_analysis'] = issue_analyzer.filter_analysis_results({
                 'code_analysis': code_analysis,
-                'recommendations': investigation['recommendations']
+                'recommendations': recommendations
             }, issue_focus)
     
+    investigation['repository_analysis'] = [repo_analysis for repo_analysis, _, _ in results]
+    investigation['potential_causes'] = potential_causes
+    investigation['recent_changes'] = recent_changes
+    investigation['affected_components'] = affected_components
+    investigation['recommendations'] = recommendations
+    
     # Generate basic recommendations if no LLM analysis was performed
     if not investigation['recommendations']:
         investigation['recommendations'] = _generate_recommendations(report, config)
@@ -644,67 +871,69 @@ def _investigate_bug(report: Dict, config: Dict) -> Dict:
 
 def _generate_recommendations(report: Dict, config: Dict) -> List[str]:
     """Generate recommendations based on bug report and repository context"""
-    recommendations = []
+    # Insertion-ordered set, so repeats are dropped and the order stays stable
+    recommendations = {}
     
     # Extract bug keywords
     bug_text = f"{report.get('summary', '')} {report.get('steps', '')}".lower()
+    has_mobile = 'mobile' in bug_text
+    has_performance = 'performance' in bug_text
+    is_slow = has_performance or 'slow' in bug_text
+    has_error = 'error' in bug_text or 'crash' in bug_text
     
     # Site type specific recommendations
     for repo in config['repos']:
         site_type = repo.get('site_type', '').lower()
         hosting = repo.get('hosting_platform', '').lower()
         
-        if 'mobile' in bug_text and 'performance' in bug_text:
+        if has_mobile and has_performance:
             if site_type == 'wordpress':
-                recommendations.append("Check WordPress mobile optimization plugins and theme responsiveness")
+                recommendations["Check WordPress mobile optimization plugins and theme responsiveness"] = None
                 if hosting == 'wordpress-vip':
-                    recommendations.append("Review VIP's mobile performance guidelines and caching configuration")
+                    recommendations["Review VIP's mobile performance guidelines and caching configuration"] = None
             elif site_type == 'react':
-                recommendations.append("Check React component re-rendering and mobile-specific optimizations")
+                recommendations["Check React component re-rendering and mobile-specific optimizations"] = None
         
-        if 'slow' in bug_text or 'performance' in bug_text:
-            recommendations.append("Review recent code changes for performance impact")
-            recommendations.append("Check for large file uploads or heavy database queries")
+        if is_slow:
+            recommendations["Review recent code changes for performance impact"] = None
+            recommendations["Check for large file uploads or heavy database queries"] = None
         
-        if 'error' in bug_text or 'crash' in bug_text:
-            recommendations.append("Review error logs and recent commits for breaking changes")
-            recommendations.append("Check for missing dependencies or configuration issues")
+        if has_error:
+            recommendations["Review error logs and recent commits for breaking changes"] = None
+            recommendations["Check for missing dependencies or configuration issues"] = None
     
     # General recommendations
-    recommendations.append("Review recent commits for potential root causes")
-    recommendations.append("Check affected files for syntax errors or logic issues")
-    recommendations.append("Test the reported steps to reproduce the issue")
+    recommendations.update(dict.fromkeys(GENERAL_RECOMMENDATIONS))
     
-    return list(set(recommendations))  # Remove duplicates
+    return list(recommendations)
 
 def _format_investigation_report(report: Dict, investigation: Dict) -> str:
     """Format the investigation report for Slack"""
-    response = f"🔍 **Bug Investigation Report - {report['report_id']}**\n\n"
+    parts = [f"🔍 **Bug Investigation Report - {report['report_id']}**\n\n"]
+    append = parts.append
     
     # Bug summary
-    response += f"**Bug Summary:**\n{report.get('summary', 'N/A')}\n\n"
+    append(f"**Bug Summary:**\n{report.get('summary', 'N/A')}\n\n")
+    
+    focused = investigation.get('focused_analysis') or {}
+    recent_changes = investigation['recent_changes']
+    repository_analysis = investigation['repository_analysis']
     
     # Issue-Focused Analysis Summary
-    if investigation.get('issue_focus'):
-        issue_focus = investigation['issue_focus']
-        response += issue_analyzer.generate_issue_specific_summary(issue_focus, investigation.get('focused_analysis', {}))
-        response += "\n\n"
+    if issue_focus := investigation.get('issue_focus'):
+        parts.extend((issue_analyzer.generate_issue_specific_summary(issue_focus, focused), "\n\n"))
     
     # Risk Assessment (if available)
-    if investigation.get('risk_assessment'):
-        risk = investigation['risk_assessment']
-        response += "**🚨 Risk Assessment:**\n"
-        for risk_type, level in risk.items():
-            if isinstance(level, dict) and 'level' in level:
-                response += f"• {risk_type}: {level['level']}\n"
-            elif isinstance(level, str):
-                response += f"• {risk_type}: {level}\n"
-        response += "\n"
+    if risk := investigation.get('risk_assessment'):
+        append("**🚨 Risk Assessment:**\n")
+        for risk_type, info in risk.items():
+            append(f"• {risk_type}: {info['level']}\n")
+        append("\n")
     
     # Repository analysis status
-    if investigation['repository_analysis']:
-        response += "**Repository Analysis:**\n"
-        for repo_analysis in investigation['repository_analysis']:
+    if repository_analysis:
+        append("**Repository Analysis:**\n")
+        for repo_analysis in repository_analysis:
             repo_name = repo_analysis.get('name', 'Unknown')
             repo_type = repo_analysis.get('type', 'unknown')
             status = repo_analysis.get('status', 'unknown')
@@ -712,151 +941,165 @@ def _format_investigation_report(report: Dict, investigation: Dict) -> str:
             if status == 'analyzed':
                 commits_count = len(repo_analysis.get('recent_commits', []))
                 files_count = len(repo_analysis.get('changed_files', []))
-                response += f"• {repo_name} ({repo_type}): {commits_count} recent commits, {files_count} files changed\n"
+                append(f"• {repo_name} ({repo_type}): {commits_count} recent commits, {files_count} files changed\n")
             elif status == 'error':
                 error = repo_analysis.get('error', 'Unknown error')
-                response += f"• {repo_name} ({repo_type}): ❌ Error - {error}\n"
+                append(f"• {repo_name} ({repo_type}): ❌ Error - {error}\n")
             else:
-                response += f"• {repo_name} ({repo_type}): ⏳ Analysis pending\n"
-        response += "\n"
+                append(f"• {repo_name} ({repo_type}): ⏳ Analysis pending\n")
+        append("\n")
     
     # Issue-Focused Code Analysis Results (if available)
-    if investigation.get('focused_analysis') and investigation['focused_analysis'].get('focused_analysis'):
-        focused_analysis = investigation['focused_analysis']['focused_analysis']
-        response += "**🎯 Issue-Focused Code Analysis:**\n"
+    if focused_analysis := focused.get('focused_analysis'):
+        append("**🎯 Issue-Focused Code Analysis:**\n")
         
         # Show only relevant analysis based on the issue type
-        if focused_analysis.get('mobile_issues'):
-            response += f"• **📱 Mobile Issues:** {len(focused_analysis['mobile_issues'])} issues found\n"
+        if mobile_issues := focused_analysis.get('mobile_issues'):
+            append(f"• **📱 Mobile Issues:** {len(mobile_issues)} issues found\n")
         
-        if focused_analysis.get('performance_issues'):
-            response += f"• **⚡ Performance Issues:** {len(focused_analysis['performance_issues'])} issues found\n"
+        if performance_issues := focused_analysis.get('performance_issues'):
+            append(f"• **⚡ Performance Issues:** {len(performance_issues)} issues found\n")
         
-        if focused_analysis.get('security_issues'):
-            response += f"• **🔒 Security Issues:** {len(focused_analysis['security_issues'])} issues found\n"
+        if security_issues := focused_analysis.get('security_issues'):
+            append(f"• **🔒 Security Issues:** {len(security_issues)} issues found\n")
         
-        if focused_analysis.get('theme_analysis'):
-            theme_analysis = focused_analysis['theme_analysis']
-            if theme_analysis.get('mobile_responsiveness'):
-                response += f"• **📱 Responsive Design Issues:** {len(theme_analysis['mobile_responsiveness'])} issues found\n"
+        theme_analysis = focused_analysis.get('theme_analysis')
+        if theme_analysis and (responsive_issues := theme_analysis.get('mobile_responsiveness')):
+            append(f"• **📱 Responsive Design Issues:** {len(responsive_issues)} issues found\n")
         
-        response += "\n"
+        append("\n")
     
     # LLM Analysis Results (if available)
-    if investigation.get('llm_analysis'):
-        llm_analysis = investigation['llm_analysis']
-        response += "**🤖 AI-Powered Analysis:**\n"
-        
-        # WordPress Core Analysis
-        if llm_analysis.get('wordpress_analysis'):
-            wp_analysis = llm_analysis['wordpress_analysis']
-            if isinstance(wp_analysis, dict) and 'analysis' in wp_analysis:
-                response += f"• **WordPress Core:** {wp_analysis['analysis'][:200]}...\n"
-        
-        # Theme Analysis
-        if llm_analysis.get('theme_analysis'):
-            theme_analysis = llm_analysis['theme_analysis']
-            if isinstance(theme_analysis, dict) and 'analysis' in theme_analysis:
-                response += f"• **Theme Issues:** {theme_analysis['analysis'][:200]}...\n"
+    if llm_analysis := investigation.get('llm_analysis'):
+        append("**🤖 AI-Powered Analysis:**\n")
         
-        # Plugin Analysis
-        if llm_analysis.get('plugin_analysis'):
-            plugin_analysis = llm_analysis['plugin_analysis']
-            if isinstance(plugin_analysis, dict) and 'analysis' in plugin_analysis:
-                response += f"• **Plugin Issues:** {plugin_analysis['analysis'][:200]}...\n"
+        # WordPress core, theme, plugin and performance analyses, in that order
+        for key, label in LLM_ANALYSIS_SECTIONS:
+            section = llm_analysis.get(key)
+            if isinstance(section, dict) and (analysis := section.get('analysis')) is not None:
+                append(f"• **{label}:** {analysis[:200]}...\n")
         
-        # Performance Analysis
-        if llm_analysis.get('performance_analysis'):
-            perf_analysis = llm_analysis['performance_analysis']
-            if isinstance(perf_analysis, dict) and 'analysis' in perf_analysis:
-                response += f"• **Performance:** {perf_analysis['analysis'][:200]}...\n"
-        
-        response += "\n"
+        append("\n")
     
     # Recent changes analysis
-    if investigation['recent_changes']:
-        response += "**Recent Code Changes:**\n"
-        for commit in investigation['recent_changes'][:3]:
-            response += f"• {commit['sha']} - {commit['message'][:50]}...\n"
-        response += "\n"
+    if recent_changes:
+        append("**Recent Code Changes:**\n")
+        for commit in recent_changes[:3]:
+            append(f"• {commit['sha']} - {commit['message'][:50]}...\n")
+        append("\n")
     
     # Potential causes
     if investigation['potential_causes']:
-        response += "**Potential Root Causes:**\n"
+        append("**Potential Root Causes:**\n")
         for cause in investigation['potential_causes'][:3]:
-            response += f"• {cause['commit']} - {cause['message'][:60]}...\n"
-            response += f"  Impact Score: {cause['impact_score']}\n"
-        response += "\n"
+            append(f"• {cause['commit']} - {cause['message'][:60]}...\n  Impact Score: {cause['impact_score']}\n")
+        append("\n")
     
     # Affected components
     if investigation['affected_components']:
-        response += "**Affected Components:**\n"
+        append("**Affected Components:**\n")
         for component in investigation['affected_components'][:5]:
-            response += f"• {component}\n"
-        response += "\n"
+            append(f"• {component}\n")
+        append("\n")
     
     # Issue-Focused Recommendations
-    if investigation.get('focused_analysis') and investigation['focused_analysis'].get('relevant_recommendations'):
-        relevant_recs = investigation['focused_analysis']['relevant_recommendations']
-        response += "**🎯 Issue-Focused Recommendations:**\n"
+    if relevant_recs := focused.get('relevant_recommendations'):
+        append("**🎯 Issue-Focused Recommendations:**\n")
         for i, rec in enumerate(relevant_recs, 1):
-            response += f"{i}. {rec}\n"
+            append(f"{i}. {rec}\n")
     elif investigation['recommendations']:
-        response += "**🎯 Recommendations:**\n"
+        append("**🎯 Recommendations:**\n")
         for i, rec in enumerate(investigation['recommendations'][:5], 1):
-            response += f"{i}. {rec}\n"
+            append(f"{i}. {rec}\n")
     
     # Add helpful message about tokens if no commits were found
-    if not investigation['recent_changes'] and investigation['repository_analysis']:
-        response += "\n💡 **To get detailed code analysis:**\n"
-        response += "• Add `AZURE_DEVOPS_TOKEN` to your `.env` file for Azure repositories\n"
-        response += "• Add `GITHUB_TOKEN` to your `.env` file for GitHub repositories\n"
-        response += "• Add `OPENAI_API_KEY` to your `.env` file for AI-powered analysis\n"
-        response += "• Get tokens from your platform's developer settings\n"
+    if not recent_changes and repository_analysis:
+        append(
+            "\n💡 **To get detailed code analysis:**\n"
+            "• Add `AZURE_DEVOPS_TOKEN` to your `.env` file for Azure repositories\n"
+            "• Add `GITHUB_TOKEN` to your `.env` file for GitHub repositories\n"
+            "• Add `OPENAI_API_KEY` to your `.env` file for AI-powered analysis\n"
+            "• Get tokens from your platform's developer settings\n"
+        )
     
-    return response
+    return "".join(parts)
 
-@app.event("message")
-def handle_message(event, say):
-    user_id = event.get("user")
-    channel = event.get("channel")
-    text = event.get("text", "").strip()
-    event_type = event.get("type")
+def _section_blocks(text: str) -> List[Dict]:
+    """Split mrkdwn text into section blocks, breaking between paragraphs where possible"""
+    chunks = []
+    for paragraph in text.split("\n\n"):
+        # A paragraph longer than a whole section is cut into section-sized pieces
+        for start in range(0, len(paragraph), SECTION_TEXT_LIMIT):
+            piece = paragraph[start:start + SECTION_TEXT_LIMIT]
+            if chunks and len(chunks[-1]) + 2 + len(piece) <= SECTION_TEXT_LIMIT:
+                chunks[-1] = f"{chunks[-1]}\n\n{piece}"
+            else:
+                chunks.append(piece)
     
+    return [
+        {"type": "section", "text": {"type": "mrkdwn", "text": chunk}}
+        for chunk in chunks if chunk.strip()
+    ][:MAX_MESSAGE_BLOCKS]
 
+def _investigation_report_message(report: Dict, investigation: Dict) -> Dict:
+    """Build the Block Kit message for an investigation report"""
+    return {
+        "text": f"🔍 Bug Investigation Report - {report['report_id']}",
+        "blocks": _section_blocks(_format_investigation_report(report, investigation))
+    }
+
+def _advance_step(user_id: str, channel: str, user_state: Conversation, text: str, say):
+    """Store the answer for the current step and prompt for the next one"""
+    field, prompt = STEPS[user_state.step]
+    setattr(user_state, field, text)
     
-    # Skip bot messages and messages without user
-    if not user_id or event.get("bot_id"):
+    if prompt:
+        user_state.step += 1
+        user_conversations[user_id] = user_state
+        say(prompt)
         return
     
-    # Check if user is in an active conversation
-    if user_id not in user_conversations:
-        return
+    # Last step answered; step-by-step reports are shown but, as before, not saved
+    _finish_report(user_id, channel, user_state, say, save=False)
 
-    user_state = user_conversations[user_id]
-    step = user_state["step"]
-
-    if step == 0:
-        user_state["data"]["summary"] = text
-        say("Which *page(s)* are affected? (Please paste full URLs)")
-    elif step == 1:
-        user_state["data"]["pages"] = text
-        say("How can we *reproduce* the issue?")
-    elif step == 2:
-        user_state["data"]["steps"] = text
-        say("Are there any *templates or components* involved? _(Optional)_")
-    elif step == 3:
-        user_state["data"]["components"] = text
-        report = format_bug_report(user_state["data"])
-        say(f"✅ Here's your bug report:\n```{report}```\nI'll notify the dev team!")
-        del user_conversations[user_id]
+@app.event("message")
+def handle_message(event: Dict, say):
+    # Edits, deletions, joins etc. can't answer a conversation step
+    if event.get("subtype") not in USER_MESSAGE_SUBTYPES:
+        return
+    
+    user_id = event.get("user")
+    
+    # Skip bot messages, messages without user and empty messages before doing any other work
+    if not user_id or event.get("bot_id"):
         return
+    text = event.get("text")
+    if not text:
+        return
+    if text[0].isspace() or text[-1].isspace():
+        text = text.strip()
+    
+    with _user_lock(user_id):
+        # Check if user is in an active conversation
+        user_state = user_conversations.get(user_id)
+        if user_state is None:
+            return
 
-    user_state["step"] += 1
+        channel = event.get("channel")
+        _advance_step(user_id, channel, user_state, text, partial(reply_sender.say, channel, user=user_id))
 
 if __name__ == "__main__":
+    # BOT_DEBUG=1 logs the repository analysis steps of each investigation
+    logging.basicConfig(level=logging.DEBUG if os.getenv("BOT_DEBUG") == "1" else logging.INFO)
     print("🔍 Checking app configuration...")
     check_app_config()
     print("\n🚀 Starting bot...")
-    handler = SocketModeHandler(app, os.environ["SLACK_APP_TOKEN"])
+    # Events are dispatched on the Socket Mode pool and listeners run on the
+    # app's listener executor, both SOCKET_MODE_CONCURRENCY threads wide, so a
+    # slow say() for one user doesn't block events from other users
+    handler = SocketModeHandler(
+        app,
+        os.environ["SLACK_APP_TOKEN"],
+        concurrency=SOCKET_MODE_CONCURRENCY
+    )
     handler.start()
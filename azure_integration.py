@@ -1,9 +1,14 @@
+import logging
 import os
-import requests
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import re
 
+from http_session import HTTP_TIMEOUT, create_session
+from code_file_analyzer import classify_changed_file
+
+logger = logging.getLogger(__name__)
+
 class AzureDevOpsAnalyzer:
     """Analyze Azure DevOps repositories for bug investigation"""
     
@@ -11,6 +16,8 @@ class AzureDevOpsAnalyzer:
         """Initialize Azure DevOps API client"""
         self.azure_token = azure_token
         self.base_url = "https://dev.azure.com"
+        # Reuse connections across the per-commit requests of one analysis
+        self.session = create_session()
     
     def _get_token(self):
         """Get Azure token, reloading from environment if needed"""
@@ -37,7 +44,7 @@ class AzureDevOpsAnalyzer:
         azure_token = self._get_token()
         
         if not azure_token:
-            print("No Azure DevOps token configured")
+            logger.warning("No Azure DevOps token configured")
             return []
         
         try:
@@ -64,7 +71,7 @@ class AzureDevOpsAnalyzer:
                 'searchCriteria.itemVersion.version': branch
             }
             
-            response = requests.get(api_url, headers=headers, params=params)
+            response = self.session.get(api_url, headers=headers, params=params, timeout=HTTP_TIMEOUT)
             
             if response.status_code == 200:
                 data = response.json()
@@ -83,7 +90,7 @@ class AzureDevOpsAnalyzer:
                     # Get files changed in this commit
                     try:
                         changes_url = f"{self.base_url}/{org}/{project}/_apis/git/repositories/{repo}/commits/{commit['commitId']}/changes"
-                        changes_response = requests.get(changes_url, headers=headers, params={'api-version': '6.0'})
+                        changes_response = self.session.get(changes_url, headers=headers, params={'api-version': '6.0'}, timeout=HTTP_TIMEOUT)
                         
                         if changes_response.status_code == 200:
                             changes_data = changes_response.json()
@@ -96,17 +103,17 @@ class AzureDevOpsAnalyzer:
                                     'changes': 1
                                 })
                     except Exception as e:
-                        print(f"Error getting file changes: {e}")
+                        logger.error("Error getting file changes: %s", e)
                     
                     commits.append(commit_info)
                 
                 return commits
             else:
-                print(f"Error fetching Azure DevOps commits: {response.status_code}")
+                logger.error("Error fetching Azure DevOps commits: %s", response.status_code)
                 return []
                 
         except Exception as e:
-            print(f"Error analyzing Azure DevOps repository: {e}")
+            logger.error("Error analyzing Azure DevOps repository: %s", e)
             return []
     
     def analyze_commit_impact(self, commits: List[Dict], bug_keywords: List[str]) -> Dict:
@@ -171,15 +178,10 @@ class AzureDevOpsAnalyzer:
             filename = file['filename'].lower()
             
             # Check file type relevance
-            if any(ext in filename for ext in ['.js', '.jsx', '.ts', '.tsx', '.css', '.scss']):
-                analysis['score'] += 1  # Frontend files
-                analysis['file_types'].add('frontend')
-            elif any(ext in filename for ext in ['.php', '.py', '.java', '.rb']):
-                analysis['score'] += 1  # Backend files
-                analysis['file_types'].add('backend')
-            elif any(ext in filename for ext in ['.html', '.htm', '.xml']):
-                analysis['score'] += 1  # Template files
-                analysis['file_types'].add('template')
+            file_type = classify_changed_file(filename)
+            if file_type:
+                analysis['score'] += 1
+                analysis['file_types'].add(file_type)
             
             # Check filename for bug-related keywords
             for keyword in bug_keywords:
@@ -221,7 +223,7 @@ class AzureDevOpsAnalyzer:
             
             params = {'api-version': '6.0'}
             
-            response = requests.get(api_url, headers=headers, params=params)
+            response = self.session.get(api_url, headers=headers, params=params, timeout=HTTP_TIMEOUT)
             
             if response.status_code == 200:
                 data = response.json()
@@ -239,11 +241,11 @@ class AzureDevOpsAnalyzer:
                 
                 return stats
             else:
-                print(f"Error fetching Azure DevOps repository stats: {response.status_code}")
+                logger.error("Error fetching Azure DevOps repository stats: %s", response.status_code)
                 return {}
                 
         except Exception as e:
-            print(f"Error getting Azure DevOps repository stats: {e}")
+            logger.error("Error getting Azure DevOps repository stats: %s", e)
             return {}
 
 # Global instance - will load token when needed
@@ -1,11 +1,38 @@
+import logging
 import os
-import requests
 import json
 import re
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import base64
 
+from http_session import HTTP_TIMEOUT, create_session
+
+logger = logging.getLogger(__name__)
+
+# File extensions used to classify changed files
+FRONTEND_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx', '.css', '.scss')
+BACKEND_EXTENSIONS = ('.php', '.py', '.java', '.rb')
+TEMPLATE_EXTENSIONS = ('.html', '.htm', '.xml')
+
+# Each type's extensions matched anywhere in a path, as the original substring
+# scan did, so package.json and app.js.map still count as frontend
+FILE_TYPE_PATTERNS = tuple(
+    (file_type, re.compile('|'.join(map(re.escape, extensions))))
+    for file_type, extensions in (
+        ('frontend', FRONTEND_EXTENSIONS),
+        ('backend', BACKEND_EXTENSIONS),
+        ('template', TEMPLATE_EXTENSIONS)
+    )
+)
+
+def classify_changed_file(filename: str) -> Optional[str]:
+    """Return 'frontend', 'backend' or 'template' for a lowercased file path, or None"""
+    for file_type, pattern in FILE_TYPE_PATTERNS:
+        if pattern.search(filename):
+            return file_type
+    return None
+
 class CodeFileAnalyzer:
     """Analyze actual code files from repositories for specific issues"""
     
@@ -13,6 +40,8 @@ class CodeFileAnalyzer:
         """Initialize with repository tokens"""
         self.azure_token = azure_token or os.getenv('AZURE_DEVOPS_TOKEN')
         self.github_token = github_token or os.getenv('GITHUB_TOKEN')
+        # Reuse connections across the file fetches of one investigation
+        self.session = create_session()
     
     def analyze_wordpress_site_code(self, repo_config: Dict, recent_commits: List[Dict]) -> Dict:
         """Perform deep code analysis of WordPress site files"""
@@ -279,7 +308,7 @@ class CodeFileAnalyzer:
             elif repo_config.get('type') == 'github':
                 return self._get_github_file_content(repo_config, file_path)
         except Exception as e:
-            print(f"Error getting file content for {file_path}: {e}")
+            logger.error("Error getting file content for %s: %s", file_path, e)
         return None
     
     def _get_azure_file_content(self, repo_config: Dict, file_path: str) -> Optional[str]:
@@ -306,7 +335,7 @@ class CodeFileAnalyzer:
                 'includeContent': 'true'
             }
             
-            response = requests.get(api_url, headers=headers, params=params)
+            response = self.session.get(api_url, headers=headers, params=params, timeout=HTTP_TIMEOUT)
             
             if response.status_code == 200:
                 data = response.json()
@@ -321,10 +350,10 @@ class CodeFileAnalyzer:
                 # File not found, skip silently
                 return None
             else:
-                print(f"Azure API error {response.status_code}: {response.text[:100]}")
+                logger.error("Azure API error %s: %s", response.status_code, response.text[:100])
                     
         except Exception as e:
-            print(f"Azure file content error for {file_path}: {e}")
+            logger.error("Azure file content error for %s: %s", file_path, e)
         
         return None
     
@@ -346,13 +375,13 @@ class CodeFileAnalyzer:
                 'Accept': 'application/vnd.github.v3.raw'
             }
             
-            response = requests.get(api_url, headers=headers)
+            response = self.session.get(api_url, headers=headers, timeout=HTTP_TIMEOUT)
             
             if response.status_code == 200:
                 return response.text
                 
         except Exception as e:
-            print(f"GitHub file content error: {e}")
+            logger.error("GitHub file content error: %s", e)
         
         return None
     
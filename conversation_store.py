@@ -0,0 +1,126 @@
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional
+from dotenv import load_dotenv
+from ttl_cache import TTLCache
+
+# Load environment variables
+load_dotenv()
+
+# Abandoned conversations expire after 30 minutes without a reply
+CONVERSATION_TTL_SECONDS = 30 * 60
+
+# Most conversations kept in memory; past this the least recently active are dropped
+MAX_MEMORY_CONVERSATIONS = 10_000
+
+@dataclass(slots=True)
+class Conversation:
+    """A bug report being collected from a user"""
+    step: int = 0
+    summary: str = ""
+    pages: str = ""
+    steps: str = ""
+    components: str = ""
+
+    def data(self) -> Dict[str, str]:
+        """Return the fields collected so far"""
+        return {
+            field: value for field, value in (
+                ("summary", self.summary),
+                ("pages", self.pages),
+                ("steps", self.steps),
+                ("components", self.components)
+            ) if value
+        }
+
+class MemoryConversationStore:
+    """Keep per-user bug report conversations in process memory"""
+
+    def __init__(self, ttl: int = CONVERSATION_TTL_SECONDS, maxsize: int = MAX_MEMORY_CONVERSATIONS):
+        self._conversations = TTLCache(ttl, maxsize=maxsize)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._conversations
+
+    def get(self, user_id: str) -> Optional[Conversation]:
+        """Get the conversation state for a user"""
+        return self._conversations.get(user_id)
+
+    def __setitem__(self, user_id: str, state: Conversation):
+        self._conversations[user_id] = state
+
+    def __delitem__(self, user_id: str):
+        del self._conversations[user_id]
+
+    def pop(self, user_id: str, default=None) -> Optional[Conversation]:
+        """Remove and return the conversation state for a user"""
+        return self._conversations.pop(user_id, default)
+
+class RedisConversationStore:
+    """Keep per-user bug report conversations in Redis so every bot replica shares them"""
+
+    def __init__(self, redis_url: str, ttl: int = CONVERSATION_TTL_SECONDS):
+        import redis
+
+        self.client = redis.Redis.from_url(redis_url)
+        self.ttl = ttl
+
+    def _key(self, user_id: str) -> str:
+        return f"bug:{user_id}"
+
+    def __contains__(self, user_id: str) -> bool:
+        return bool(self.client.exists(self._key(user_id)))
+
+    def get(self, user_id: str) -> Optional[Conversation]:
+        """Get the conversation state for a user"""
+        return self._from_hash(self.client.hgetall(self._key(user_id)))
+    
+    def _from_hash(self, state: Dict[bytes, bytes]) -> Optional[Conversation]:
+        """Rebuild a conversation from its Redis hash, which is empty when there is none"""
+        if not state:
+            return None
+        return Conversation(
+            step=int(state[b"step"]),
+            summary=state.get(b"summary", b"").decode(),
+            pages=state.get(b"pages", b"").decode(),
+            steps=state.get(b"steps", b"").decode(),
+            components=state.get(b"components", b"").decode()
+        )
+
+    def __setitem__(self, user_id: str, state: Conversation):
+        key = self._key(user_id)
+        pipe = self.client.pipeline()
+        pipe.hset(key, mapping={
+            "step": state.step,
+            "summary": state.summary,
+            "pages": state.pages,
+            "steps": state.steps,
+            "components": state.components
+        })
+        pipe.expire(key, self.ttl)
+        pipe.execute()
+
+    def __delitem__(self, user_id: str):
+        if not self.client.delete(self._key(user_id)):
+            raise KeyError(user_id)
+
+    def pop(self, user_id: str, default=None) -> Optional[Conversation]:
+        """Remove and return the conversation state for a user"""
+        # Read and delete in one MULTI/EXEC, so when two bot replicas finish the
+        # same conversation only one of them gets it back
+        key = self._key(user_id)
+        pipe = self.client.pipeline(transaction=True)
+        pipe.hgetall(key)
+        pipe.delete(key)
+        state = self._from_hash(pipe.execute()[0])
+        return default if state is None else state
+
+def create_conversation_store():
+    """Use Redis when REDIS_URL is configured, otherwise keep state in memory"""
+    redis_url = os.getenv('REDIS_URL')
+    if redis_url:
+        return RedisConversationStore(redis_url)
+    return MemoryConversationStore()
+
+# Global conversation store instance
+conversation_store = create_conversation_store()
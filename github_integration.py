@@ -1,9 +1,14 @@
+import logging
 import os
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from github import Github, GithubException
 import re
 
+from code_file_analyzer import classify_changed_file
+
+logger = logging.getLogger(__name__)
+
 class GitHubAnalyzer:
     """Analyze GitHub repositories for bug investigation"""
     
@@ -73,7 +78,7 @@ class GitHubAnalyzer:
             return commit_data
             
         except (GithubException, ValueError) as e:
-            print(f"Error fetching GitHub commits: {e}")
+            logger.error("Error fetching GitHub commits: %s", e)
             return []
     
     def analyze_commit_impact(self, commits: List[Dict], bug_keywords: List[str]) -> Dict:
@@ -138,15 +143,10 @@ class GitHubAnalyzer:
             filename = file['filename'].lower()
             
             # Check file type relevance
-            if any(ext in filename for ext in ['.js', '.jsx', '.ts', '.tsx', '.css', '.scss']):
-                analysis['score'] += 1  # Frontend files
-                analysis['file_types'].add('frontend')
-            elif any(ext in filename for ext in ['.php', '.py', '.java', '.rb']):
-                analysis['score'] += 1  # Backend files
-                analysis['file_types'].add('backend')
-            elif any(ext in filename for ext in ['.html', '.htm', '.xml']):
-                analysis['score'] += 1  # Template files
-                analysis['file_types'].add('template')
+            file_type = classify_changed_file(filename)
+            if file_type:
+                analysis['score'] += 1
+                analysis['file_types'].add(file_type)
             
             # Check filename for bug-related keywords
             for keyword in bug_keywords:
@@ -227,7 +227,7 @@ class GitHubAnalyzer:
             return detection
             
         except (GithubException, ValueError) as e:
-            print(f"Error detecting site type from GitHub: {e}")
+            logger.error("Error detecting site type from GitHub: %s", e)
             return {'site_type': 'unknown', 'confidence': 'low'}
     
     def get_repository_stats(self, repo_url: str, branch: str = "main") -> Dict:
@@ -254,7 +254,7 @@ class GitHubAnalyzer:
             return stats
             
         except (GithubException, ValueError) as e:
-            print(f"Error fetching repository stats: {e}")
+            logger.error("Error fetching repository stats: %s", e)
             return {}
 
 # Global instance
@@ -0,0 +1,17 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Transient server errors are retried with backoff; the last response is returned
+# rather than raised so callers keep checking status_code themselves. 429 is not
+# retried, since honouring its Retry-After could park an investigation worker
+HTTP_RETRY = Retry(total=3, backoff_factor=0.2, status_forcelist=(500, 502, 503, 504), raise_on_status=False)
+
+# Seconds to wait for a repository API to connect, then to send each response
+HTTP_TIMEOUT = (5, 30)
+
+def create_session() -> requests.Session:
+    """Create a session that reuses connections and retries transient HTTPS failures"""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(max_retries=HTTP_RETRY))
+    return session
@@ -1,11 +1,18 @@
 import os
-import requests
 import json
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import re
 from pathlib import Path
 
+from http_session import create_session
+
+# Seconds to wait for OpenAI to connect, then for each completion to come back
+LLM_TIMEOUT = (5, 60)
+
+# Per-area analyses run for a WordPress site, each one LLM call
+LLM_SECTION_KEYS = ('wordpress_analysis', 'theme_analysis', 'plugin_analysis', 'performance_analysis', 'security_analysis')
+
 class LLMAnalyzer:
     """LLM-powered code analyzer for bug investigations"""
     
@@ -13,6 +20,8 @@ class LLMAnalyzer:
         """Initialize LLM analyzer with OpenAI API key"""
         self.openai_api_key = openai_api_key or os.getenv('OPENAI_API_KEY')
         self.base_url = "https://api.openai.com/v1/chat/completions"
+        # Reuse connections across the several completions of one investigation
+        self.session = create_session()
         
     def analyze_wordpress_site(self, repo_url: str, bug_report: Dict, recent_commits: List[Dict]) -> Dict:
         """Comprehensive WordPress site analysis using LLM"""
@@ -45,12 +54,17 @@ class LLMAnalyzer:
         # Security analysis
         analysis['security_analysis'] = self._analyze_security(bug_report, recent_commits)
         
+        # Analyses that failed or fell back to canned text, so callers don't cache the result
+        failed = [key for key in LLM_SECTION_KEYS if self._failed(analysis[key])]
+        
         # Generate comprehensive recommendations
-        analysis['recommendations'] = self._generate_llm_recommendations(analysis, bug_report)
+        analysis['recommendations'] = self._generate_llm_recommendations(analysis, bug_report, failed)
         
         # Assess risk levels
-        analysis['risk_assessment'] = self._assess_risks(analysis)
+        analysis['risk_assessment'] = self._assess_risks(analysis, failed)
         
+        if failed:
+            analysis['error'] = f"LLM analysis incomplete: {', '.join(failed)}"
         return analysis
     
     def _analyze_wordpress_core(self, bug_report: Dict, recent_commits: List[Dict]) -> Dict:
@@ -178,7 +192,7 @@ class LLMAnalyzer:
         
         return self._call_llm(prompt, "security_analysis")
     
-    def _generate_llm_recommendations(self, analysis: Dict, bug_report: Dict) -> List[str]:
+    def _generate_llm_recommendations(self, analysis: Dict, bug_report: Dict, failed: List[str]) -> List[str]:
         """Generate comprehensive recommendations based on all analyses"""
         prompt = f"""
         Based on the following WordPress site analysis, generate specific, actionable recommendations:
@@ -201,11 +215,13 @@ class LLMAnalyzer:
         """
         
         response = self._call_llm(prompt, "recommendations")
-        if isinstance(response, dict) and 'recommendations' in response:
+        if self._failed(response):
+            failed.append("recommendations")
+        elif isinstance(response, dict) and 'recommendations' in response:
             return response['recommendations']
         return []
     
-    def _assess_risks(self, analysis: Dict) -> Dict:
+    def _assess_risks(self, analysis: Dict, failed: List[str]) -> Dict:
         """Assess risk levels for different aspects"""
         # Create a simplified analysis summary for the risk assessment
         analysis_summary = {
@@ -234,15 +250,22 @@ class LLMAnalyzer:
         result = self._call_llm(prompt, "risk_assessment")
         
         # If API call failed, provide fallback risk assessment
-        if 'error' in result:
+        if self._failed(result):
+            failed.append("risk_assessment")
             return {
-                'Security Risk': 'Medium - Review security analysis for specific issues',
-                'Performance Risk': 'High - Mobile performance issues detected',
-                'Stability Risk': 'Medium - Recent changes may affect stability',
-                'Maintenance Risk': 'Low - Standard WordPress maintenance required'
+                'Security Risk': {'level': 'Medium - Review security analysis for specific issues'},
+                'Performance Risk': {'level': 'High - Mobile performance issues detected'},
+                'Stability Risk': {'level': 'Medium - Recent changes may affect stability'},
+                'Maintenance Risk': {'level': 'Low - Standard WordPress maintenance required'}
             }
         
-        return result
+        # The model answers either "risk": "level" or "risk": {"level": ...}; store every
+        # entry as {"level": ...} and drop anything without a level
+        return {
+            risk_type: level if isinstance(level, dict) else {'level': level}
+            for risk_type, level in result.items()
+            if isinstance(level, str) or (isinstance(level, dict) and 'level' in level)
+        }
     
     def _call_llm(self, prompt: str, analysis_type: str) -> Dict:
         """Make API call to OpenAI for analysis"""
@@ -268,7 +291,7 @@ class LLMAnalyzer:
                 'temperature': 0.3
             }
             
-            response = requests.post(self.base_url, headers=headers, json=data)
+            response = self.session.post(self.base_url, headers=headers, json=data, timeout=LLM_TIMEOUT)
             
             if response.status_code == 200:
                 result = response.json()
@@ -281,13 +304,18 @@ class LLMAnalyzer:
                     return {'analysis': content, 'type': analysis_type}
             elif response.status_code == 429:
                 # Quota exceeded - provide fallback analysis
-                return self._get_fallback_analysis(analysis_type, prompt)
+                return {**self._get_fallback_analysis(analysis_type, prompt), 'fallback': True}
             else:
                 return {'error': f'API call failed: {response.status_code}', 'type': analysis_type}
                 
         except Exception as e:
             return {'error': f'LLM analysis failed: {str(e)}', 'type': analysis_type}
     
+    @staticmethod
+    def _failed(result) -> bool:
+        """Check whether an LLM call failed or returned the canned quota fallback"""
+        return isinstance(result, dict) and ('error' in result or result.get('fallback', False))
+    
     def _get_fallback_analysis(self, analysis_type: str, prompt: str) -> Dict:
         """Provide fallback analysis when API quota is exceeded"""
         fallback_analyses = {
@@ -0,0 +1,49 @@
+import logging
+import threading
+from typing import Dict, List, Optional
+from slack_sdk.errors import SlackApiError
+from ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Errors meaning the bot can't post to a channel until someone fixes membership
+UNREACHABLE_CHANNEL_ERRORS = {"channel_not_found", "not_in_channel", "is_archived"}
+
+# Such errors in a row, within 5 minutes, before a channel is treated as unreachable
+UNREACHABLE_AFTER_FAILURES = 2
+
+class ReplySender:
+    """Post bot replies to Slack, skipping channels that keep rejecting them"""
+
+    def __init__(self, client):
+        """Initialize the sender with a Slack WebClient"""
+        self.client = client
+        self._lock = threading.Lock()
+        # Membership errors per channel, forgotten after 5 minutes or a successful post
+        self._failures = TTLCache(ttl=300)
+        # Channels that rejected repeated posts, retried after 5 minutes
+        self._unreachable = TTLCache(ttl=300)
+
+    def can_reach(self, channel: str) -> bool:
+        """Check whether posts to a channel are expected to succeed"""
+        return channel not in self._unreachable
+
+    def say(self, channel: str, text: str, blocks: Optional[List[Dict]] = None, user: Optional[str] = None):
+        """Post a reply to a user, unless the channel is unreachable"""
+        if not self.can_reach(channel):
+            logger.warning("Dropping reply to %s in unreachable channel %s", user, channel)
+            return
+
+        try:
+            self.client.chat_postMessage(channel=channel, text=text, blocks=blocks)
+            self._failures.pop(channel)
+        except SlackApiError as e:
+            if e.response.get("error") in UNREACHABLE_CHANNEL_ERRORS:
+                with self._lock:
+                    failures = self._failures.get(channel, 0) + 1
+                    self._failures[channel] = failures
+                if failures >= UNREACHABLE_AFTER_FAILURES:
+                    self._unreachable[channel] = True
+            logger.error("Error posting reply to %s: %s", channel, e)
+        except Exception as e:
+            logger.error("Error posting reply to %s: %s", channel, e)
@@ -1,11 +1,15 @@
+import copy
+import logging
 import sqlite3
 import json
 import os
-from typing import Dict, List, Optional
+import threading
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass
 from enum import Enum
 from dotenv import load_dotenv
+from ttl_cache import TTLCache
 
 # Load environment variables
 load_dotenv()
@@ -13,6 +17,8 @@ load_dotenv()
 from github_integration import github_analyzer
 from azure_integration import azure_analyzer
 
+logger = logging.getLogger(__name__)
+
 class RepoType(Enum):
     GITHUB = "github"
     AZURE = "azure"
@@ -40,10 +46,21 @@ class RepositoryConfig:
             self.ignore_patterns = []
         if self.custom_tags is None:
             self.custom_tags = []
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RepositoryConfig':
+        """Rebuild a repository config from its stored JSON form"""
+        return cls(**{**data, 'type': RepoType(data['type'])})
 
 class RepositoryManager:
     def __init__(self, db_path: str = "bug_reports.db"):
         self.db_path = db_path
+        # list_channel_configs() and get_channel_config() results, reused for 30 seconds or
+        # until a write; callers get copies, so editing a result can't change the cache
+        self._configs_cache = TTLCache(30)
+        # Repository name -> (channel config, repo), rebuilt after any write
+        self._repo_index: Optional[Dict[str, Tuple[Dict, Dict]]] = None
+        self._repo_index_lock = threading.Lock()
         self.init_database()
     
     def init_database(self):
@@ -94,10 +111,19 @@ class RepositoryManager:
             ''', (channel_id, channel_name, project_name, repos_json, datetime.now()))
             
             conn.commit()
-            return cursor.rowcount > 0
+        
+        self._invalidate_caches()
+        return cursor.rowcount > 0
     
     def get_channel_config(self, channel_id: str) -> Optional[Dict]:
         """Get repository configuration for a specific channel"""
+        cache_key = ('channel', channel_id)
+        config = self._configs_cache.get(cache_key)
+        if config is not None:
+            return copy.deepcopy(config)
+        
+        # Read before the query, so a write during it keeps the result out of the cache
+        generation = self._configs_cache.generation
         with sqlite3.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
@@ -109,11 +135,17 @@ class RepositoryManager:
             if row:
                 config = dict(row)
                 config['repos'] = json.loads(config['repos'])
+                self._configs_cache.set_if_generation(cache_key, copy.deepcopy(config), generation)
                 return config
             return None
     
     def list_channel_configs(self) -> List[Dict]:
         """List all channel configurations"""
+        configs = self._configs_cache.get('all')
+        if configs is not None:
+            return copy.deepcopy(configs)
+        
+        generation = self._configs_cache.generation
         with sqlite3.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
@@ -126,8 +158,9 @@ class RepositoryManager:
                 config = dict(row)
                 config['repos'] = json.loads(config['repos'])
                 configs.append(config)
-            
-            return configs
+        
+        self._configs_cache.set_if_generation('all', copy.deepcopy(configs), generation)
+        return configs
     
     def delete_channel_config(self, channel_id: str) -> bool:
         """Delete channel configuration"""
@@ -135,7 +168,26 @@ class RepositoryManager:
             cursor = conn.cursor()
             cursor.execute('DELETE FROM channel_repos WHERE channel_id = ?', (channel_id,))
             conn.commit()
-            return cursor.rowcount > 0
+        
+        self._invalidate_caches()
+        return cursor.rowcount > 0
+    
+    def find_repo(self, repo_name: str) -> Optional[Tuple[Dict, Dict]]:
+        """Find the channel configuration and repository entry for a repository name"""
+        with self._repo_index_lock:
+            if self._repo_index is None:
+                index = {}
+                for config in self.list_channel_configs():
+                    for repo in config['repos']:
+                        index.setdefault(repo['name'], (config, repo))
+                self._repo_index = index
+            return copy.deepcopy(self._repo_index.get(repo_name))
+    
+    def _invalidate_caches(self):
+        """Drop the cached config listing and name index so the next lookup rereads them"""
+        self._configs_cache.clear()
+        with self._repo_index_lock:
+            self._repo_index = None
 
 class CodeAnalyzer:
     """Analyze code changes and repository content"""
@@ -200,7 +252,7 @@ class CodeAnalyzer:
     
     def _analyze_github_repo(self, repo_config: Dict, days: int) -> Dict:
         """Analyze GitHub repository"""
-        print(f"Analyzing GitHub repo: {repo_config['name']} - {repo_config['url']}")
+        logger.debug("Analyzing GitHub repo: %s - %s", repo_config['name'], repo_config['url'])
         try:
             # Get recent commits
             commits = github_analyzer.get_recent_commits(
@@ -234,7 +286,7 @@ class CodeAnalyzer:
             }
             
         except Exception as e:
-            print(f"Error analyzing GitHub repository: {e}")
+            logger.error("Error analyzing GitHub repository: %s", e)
             return {
                 "name": repo_config['name'],
                 "type": "github",
@@ -280,7 +332,7 @@ class CodeAnalyzer:
     
     def _analyze_azure_repo(self, repo_config: Dict, days: int) -> Dict:
         """Analyze Azure DevOps repository"""
-        print(f"Analyzing Azure repo: {repo_config['name']} - {repo_config['url']}")
+        logger.debug("Analyzing Azure repo: %s - %s", repo_config['name'], repo_config['url'])
         try:
             # Get recent commits
             commits = azure_analyzer.get_recent_commits(
@@ -314,7 +366,7 @@ class CodeAnalyzer:
             }
             
         except Exception as e:
-            print(f"Error analyzing Azure DevOps repository: {e}")
+            logger.error("Error analyzing Azure DevOps repository: %s", e)
             return {
                 "name": repo_config['name'],
                 "type": "azure",
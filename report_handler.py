@@ -1,4 +1,86 @@
-def format_bug_report(data):
+import re
+from typing import Dict
+
+# Matches each URL in a line of free text
+_URL_RE = re.compile(r'https?://[^\s]+')
+
+# Keywords that label each field in a free-form report, e.g. "Steps: ..."
+_FIELD_KEYWORDS = {
+    "summary": ("summary", "issue", "problem", "bug", "error"),
+    "pages": ("page", "url", "site", "website", "link"),
+    "steps": ("step", "reproduce", "how to"),
+    "components": ("component", "template", "module", "feature")
+}
+_KEYWORD_FIELDS = {keyword: field for field, keywords in _FIELD_KEYWORDS.items() for keyword in keywords}
+# Words that may qualify a field keyword, as in "Bug Summary:" or "Steps to reproduce:"
+_FIELD_QUALIFIERS = ("affected", "brief", "bug", "issue", "expected", "actual", "steps to", "how to")
+# A keyword ending a label at the start of a line, after any bullet or emphasis
+# and known qualifiers, e.g. "- Affected URL:" or "*Pages/URLs:*", so prose
+# such as "I got an error: 500" is not taken for a label
+_FIELD_RE = re.compile(
+    r'^[\s*_•\-]*(?:(?:' + '|'.join(q.replace(' ', r'\s+') for q in _FIELD_QUALIFIERS) + r')\s+|[\w-]+\s*/\s*){0,3}?'
+    r'(' + '|'.join(_KEYWORD_FIELDS) + r')s?[*_]*\s*:[*_]*\s*(.*)$',
+    re.IGNORECASE
+)
+
+def parse_bug_report(text: str) -> Dict[str, str]:
+    """Parse a bug report text, with the bot mention already removed, to extract structured information"""
+    # Initialize data structure
+    data = {
+        "summary": "",
+        "pages": "",
+        "steps": "",
+        "components": ""
+    }
+
+    # Try to extract information using common patterns
+    lines = text.split('\n')
+    
+    # URLs mentioned outside a "Pages:" line, used only if there is none
+    found_urls = ""
+    # First substantial line, taken as the summary only if no line is labelled one
+    guessed_summary = ""
+    
+    # Look for "keyword: value" lines with a single regex match per line
+    for i, line in enumerate(lines):
+        field_match = _FIELD_RE.match(line)
+        field = _KEYWORD_FIELDS[field_match.group(1).lower()] if field_match else None
+        if field:
+            # The first value given for a field wins
+            if not data[field]:
+                data[field] = field_match.group(2).strip()
+        elif i == 0 and len(line.strip()) > 10:
+            guessed_summary = line.strip()
+        
+        # Pages/URLs patterns
+        if field != "pages" and not found_urls and 'http' in line:
+            # Extract URLs
+            urls = _URL_RE.findall(line)
+            if urls:
+                found_urls = ', '.join(urls)
+        
+        # Every field is filled, the remaining lines can't add anything
+        if data["summary"] and data["pages"] and data["steps"] and data["components"]:
+            break
+    
+    if not data["summary"]:
+        data["summary"] = guessed_summary
+    if not data["pages"]:
+        data["pages"] = found_urls
+    
+    # If we have a multi-line response, try to intelligently parse
+    if len(lines) > 2 and not any(data.values()):
+        # Try to parse based on line position; there are at least three lines here
+        data["summary"] = lines[0].strip()
+        if 'http' in lines[1]:
+            data["pages"] = lines[1].strip()
+        data["steps"] = lines[2].strip()
+        if len(lines) >= 4:
+            data["components"] = lines[3].strip()
+    
+    return data
+
+def format_bug_report(data: Dict[str, str]) -> str:
     return f"""
 **Bug Report**
 
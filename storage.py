@@ -1,13 +1,23 @@
+import copy
 import sqlite3
 import os
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import uuid
+from ttl_cache import TTLCache
+
+# Listings, searches and stats are reused for this many seconds unless a write clears them;
+# callers get copies, so editing a result can't change what the cache holds
+READ_CACHE_TTL_SECONDS = 10
+
+# Most cached reads kept at once, since every distinct search query is its own entry
+READ_CACHE_MAXSIZE = 256
 
 class BugReportStorage:
     def __init__(self, db_path: str = "bug_reports.db"):
         """Initialize the storage system with SQLite database"""
         self.db_path = db_path
+        self._read_cache = TTLCache(READ_CACHE_TTL_SECONDS, maxsize=READ_CACHE_MAXSIZE)
         self.init_database()
     
     def init_database(self):
@@ -88,6 +98,7 @@ class BugReportStorage:
             ))
             conn.commit()
         
+        self._read_cache.clear()
         return report_id
     
     def _determine_priority(self, data: Dict[str, str]) -> str:
@@ -122,6 +133,13 @@ class BugReportStorage:
     
     def get_bug_reports(self, status: Optional[str] = None, limit: int = 10) -> List[Dict]:
         """Get bug reports with optional status filter"""
+        cache_key = ('reports', status, limit)
+        reports = self._read_cache.get(cache_key)
+        if reports is not None:
+            return copy.deepcopy(reports)
+        
+        # Read before the query, so a write during it keeps the result out of the cache
+        generation = self._read_cache.generation
         with sqlite3.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
@@ -140,7 +158,10 @@ class BugReportStorage:
                     LIMIT ?
                 ''', (limit,))
             
-            return [dict(row) for row in cursor.fetchall()]
+            reports = [dict(row) for row in cursor.fetchall()]
+        
+        self._read_cache.set_if_generation(cache_key, copy.deepcopy(reports), generation)
+        return reports
     
     def update_bug_report(self, report_id: str, updates: Dict) -> bool:
         """Update a bug report"""
@@ -172,6 +193,7 @@ class BugReportStorage:
             ''', values)
             
             conn.commit()
+            self._read_cache.clear()
             return cursor.rowcount > 0
     
     def delete_bug_report(self, report_id: str) -> bool:
@@ -180,10 +202,16 @@ class BugReportStorage:
             cursor = conn.cursor()
             cursor.execute('DELETE FROM bug_reports WHERE report_id = ?', (report_id,))
             conn.commit()
+            self._read_cache.clear()
             return cursor.rowcount > 0
     
     def get_stats(self) -> Dict:
         """Get bug report statistics"""
+        stats = self._read_cache.get('stats')
+        if stats is not None:
+            return copy.deepcopy(stats)
+        
+        generation = self._read_cache.generation
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
@@ -212,15 +240,24 @@ class BugReportStorage:
             ''')
             recent = cursor.fetchone()[0]
             
-            return {
+            stats = {
                 'total': total,
                 'by_status': status_counts,
                 'by_priority': priority_counts,
                 'recent_7_days': recent
             }
+        
+        self._read_cache.set_if_generation('stats', copy.deepcopy(stats), generation)
+        return stats
     
     def search_bug_reports(self, query: str, limit: int = 10) -> List[Dict]:
         """Search bug reports by text content"""
+        cache_key = ('search', query, limit)
+        reports = self._read_cache.get(cache_key)
+        if reports is not None:
+            return copy.deepcopy(reports)
+        
+        generation = self._read_cache.generation
         with sqlite3.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
@@ -233,7 +270,10 @@ class BugReportStorage:
                 LIMIT ?
             ''', (search_term, search_term, search_term, search_term, limit))
             
-            return [dict(row) for row in cursor.fetchall()]
+            reports = [dict(row) for row in cursor.fetchall()]
+        
+        self._read_cache.set_if_generation(cache_key, copy.deepcopy(reports), generation)
+        return reports
 
 # Global storage instance
 storage = BugReportStorage()
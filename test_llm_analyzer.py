@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Regression cases for marking incomplete LLM analyses, which app.py must not cache
+"""
+
+import unittest
+from unittest import mock
+
+from llm_analyzer import LLMAnalyzer
+
+REPORT = {"summary": "Checkout broken"}
+COMMITS = [{"sha": "abc123", "message": "Update theme"}]
+
+class AnalyzeWordPressSiteTest(unittest.TestCase):
+    """app.py caches an analysis only when it has no top-level 'error'"""
+
+    def setUp(self):
+        self.analyzer = LLMAnalyzer(openai_api_key="test-key")
+
+    def test_failed_call_marks_analysis(self):
+        def call_llm(prompt, analysis_type):
+            if analysis_type == "theme_analysis":
+                return {'error': 'API call failed: 500', 'type': analysis_type}
+            return {'analysis': 'ok', 'type': analysis_type}
+
+        with mock.patch.object(self.analyzer, "_call_llm", side_effect=call_llm):
+            analysis = self.analyzer.analyze_wordpress_site("https://example.com", REPORT, COMMITS)
+        self.assertIn("theme_analysis", analysis["error"])
+
+    def test_quota_fallback_marks_analysis(self):
+        response = mock.Mock(status_code=429)
+        with mock.patch.object(self.analyzer.session, "post", return_value=response):
+            analysis = self.analyzer.analyze_wordpress_site("https://example.com", REPORT, COMMITS)
+        self.assertIn("error", analysis)
+        # The canned text is still shown to the user
+        self.assertIn("analysis", analysis["theme_analysis"])
+
+    def test_successful_calls_are_cacheable(self):
+        def call_llm(prompt, analysis_type):
+            if analysis_type == "risk_assessment":
+                return {'Security Risk': 'Low'}
+            return {'analysis': 'ok', 'recommendations': ['Clear the cache']}
+
+        with mock.patch.object(self.analyzer, "_call_llm", side_effect=call_llm):
+            analysis = self.analyzer.analyze_wordpress_site("https://example.com", REPORT, COMMITS)
+        self.assertNotIn("error", analysis)
+        self.assertEqual(analysis["risk_assessment"], {'Security Risk': {'level': 'Low'}})
+
+if __name__ == "__main__":
+    unittest.main()
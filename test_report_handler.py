@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Regression cases for parsing free-form bug reports
+"""
+
+import unittest
+
+from report_handler import parse_bug_report
+
+class ParseBugReportTest(unittest.TestCase):
+    """Field labels that users, and the bot's own prompts, write"""
+
+    def test_plain_labels(self):
+        data = parse_bug_report(
+            "Summary: Mobile load issue\n"
+            "Pages: https://example.com/, https://example.com/about\n"
+            "Steps: Open the homepage\n"
+            "Components: Header template"
+        )
+        self.assertEqual(data, {
+            "summary": "Mobile load issue",
+            "pages": "https://example.com/, https://example.com/about",
+            "steps": "Open the homepage",
+            "components": "Header template"
+        })
+
+    def test_steps_to_reproduce_label(self):
+        # The phrase MISSING_FIELDS_PROMPT asks for
+        data = parse_bug_report("Steps to reproduce: add item, click checkout")
+        self.assertEqual(data["steps"], "add item, click checkout")
+
+    def test_how_to_reproduce_label(self):
+        data = parse_bug_report("How to reproduce: add item, click checkout")
+        self.assertEqual(data["steps"], "add item, click checkout")
+
+    def test_multi_word_labels(self):
+        data = parse_bug_report("Bug Summary: checkout broken\nAffected URL: https://example.com/cart")
+        self.assertEqual(data["summary"], "checkout broken")
+        self.assertEqual(data["pages"], "https://example.com/cart")
+
+    def test_bulleted_labels(self):
+        data = parse_bug_report("- Summary: checkout broken\n• Pages: https://example.com/cart")
+        self.assertEqual(data["summary"], "checkout broken")
+        self.assertEqual(data["pages"], "https://example.com/cart")
+
+    def test_bold_labels(self):
+        # The form NEW_REPORT_PROMPT shows
+        data = parse_bug_report("*Summary:* checkout broken\n*Steps:* click checkout\n*Templates/Components:* cart")
+        self.assertEqual(data["summary"], "checkout broken")
+        self.assertEqual(data["steps"], "click checkout")
+        self.assertEqual(data["components"], "cart")
+
+    def test_urls_outside_pages_label(self):
+        data = parse_bug_report("Summary: checkout broken\nSee https://example.com/cart")
+        self.assertEqual(data["pages"], "https://example.com/cart")
+
+    def test_labelled_summary_beats_first_line(self):
+        data = parse_bug_report("The checkout button is dead\nSummary: checkout broken")
+        self.assertEqual(data["summary"], "checkout broken")
+
+    def test_first_line_summary_without_label(self):
+        data = parse_bug_report("The checkout button is dead\nPages: https://example.com/cart")
+        self.assertEqual(data["summary"], "The checkout button is dead")
+
+    def test_prose_with_keyword_is_not_a_label(self):
+        data = parse_bug_report("Summary: checkout broken\nI got an error: 500 on checkout")
+        self.assertEqual(data["summary"], "checkout broken")
+        data = parse_bug_report("I got an error: 500 on checkout")
+        self.assertEqual(data["summary"], "I got an error: 500 on checkout")
+
+    def test_long_sentence_is_not_a_label(self):
+        data = parse_bug_report("Summary: checkout broken\nWhen I open the cart page: nothing loads")
+        self.assertEqual(data["pages"], "")
+
+if __name__ == "__main__":
+    unittest.main()
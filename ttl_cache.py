@@ -0,0 +1,93 @@
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+class TTLCache:
+    """Thread-safe dict-like cache whose entries expire a fixed time after they were last written"""
+
+    def __init__(self, ttl: float, sweep_interval: float = 60, maxsize: Optional[int] = None):
+        """Initialize the cache with a time-to-live and sweep interval in seconds
+
+        When maxsize is set, writing past it evicts the least recently written entries.
+        """
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self.maxsize = maxsize
+        # Kept in write order, which is also expiry order since every entry shares one ttl
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}
+        self._next_sweep = time.monotonic() + sweep_interval
+        # Listeners run on Bolt's worker threads, so reads and writes are serialized
+        self._lock = threading.Lock()
+        # Bumped by clear(), so a value read before a clear can't be stored after it
+        self.generation = 0
+
+    def _sweep(self, now: float):
+        """Drop every expired entry so abandoned keys don't accumulate"""
+        for key, (_, expires_at) in list(self._entries.items()):
+            if expires_at > now:
+                break
+            self._entries.pop(key, None)
+        self._next_sweep = now + self.sweep_interval
+
+    def get(self, key: Hashable, default=None):
+        """Get a value, treating expired entries as missing"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            return value
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def _set(self, key: Hashable, value: Any):
+        """Store a value; the caller holds the lock"""
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self._sweep(now)
+        # Re-insert so the entry moves to the end of the write order
+        self._entries.pop(key, None)
+        self._entries[key] = (value, now + self.ttl)
+        if self.maxsize is not None:
+            while len(self._entries) > self.maxsize:
+                del self._entries[next(iter(self._entries))]
+    
+    def __setitem__(self, key: Hashable, value: Any):
+        with self._lock:
+            self._set(key, value)
+    
+    def set_if_generation(self, key: Hashable, value: Any, generation: int) -> bool:
+        """Store a value only if the cache hasn't been cleared since generation was read"""
+        with self._lock:
+            if self.generation != generation:
+                return False
+            self._set(key, value)
+            return True
+
+    def __delitem__(self, key: Hashable):
+        if self.pop(key, _MISSING) is _MISSING:
+            raise KeyError(key)
+
+    def pop(self, key: Hashable, default=None):
+        """Remove and return a value, treating expired entries as missing"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is None or entry[1] <= time.monotonic():
+            return default
+        return entry[0]
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)